@@ -44,7 +44,7 @@ class DirActions:
         try:
             os.makedirs(directory, exist_ok=True)
         except Exception as e:
-            logger.error(f"Failed to create directory {directory}. Reason: {str(e)}")
+            logger.error("Failed to create directory %s. Reason: %s", directory, e)
             return False
         return True
 
@@ -61,7 +61,7 @@ class DirActions:
         try:
             shutil.rmtree(directory)
         except Exception as e:
-            logger.error(f"Failed to delete directory {directory}. Reason: {str(e)}")
+            logger.error("Failed to delete directory %s. Reason: %s", directory, e)
             return False
         return True
 
@@ -93,7 +93,7 @@ class DirActions:
                 if os.path.exists(symlink_target_path):
                     directory_contents[symlink_target_path] = os.stat(symlink_target_path).st_size
                 else:
-                    logger.warning(f"Broken symbolic link detected: {item_full_path}")
+                    logger.warning("Broken symbolic link detected: %s", item_full_path)
 
             elif os.path.exists(item_full_path):
                 directory_contents[item_full_path] = os.stat(item_full_path).st_size
@@ -123,7 +123,7 @@ class DirActions:
                 else:
                     shutil.copy2(s, d)
         except shutil.Error as e:
-            logger.error(f"Failed to copy {source_dir} to {destination_dir}: {e}")
+            logger.error("Failed to copy %s to %s: %s", source_dir, destination_dir, e)
             return False
         return True
 
@@ -148,7 +148,7 @@ class DirActions:
                     elif os.path.isdir(file_path):
                         shutil.rmtree(file_path)
         except Exception as e:
-            logger.error(f"Failed to delete files and directories from {directory}. Reason: {str(e)}")
+            logger.error("Failed to delete files and directories from %s. Reason: %s", directory, e)
             return False
 
         return True
@@ -47,7 +47,7 @@ class DirNode(INode):
             self._update_attributes()
             return self._bpass(f"Successfully created dir: {self.path}")
         except Exception as e:
-            logger.error(f"Failed to create dir path: {self.path}. Error: {str(e)}")
+            logger.error("Failed to create dir path: %s. Error: %s", self.path, e)
             return False
 
     def delete(self) -> bool:
@@ -62,7 +62,7 @@ class DirNode(INode):
             self._update_attributes()
             return self._bpass(f"Successfully deleted dir: {self.path}")
         except Exception as e:
-            logger.error(f"Failed to delete directory {self.path}. Reason: {str(e)}")
+            logger.error("Failed to delete directory %s. Reason: %s", self.path, e)
             return False
 
     def list(self) -> List[INode]:
@@ -85,7 +85,7 @@ class DirNode(INode):
             elif os.path.isdir(item_path):
                 directory_contents.append(DirNode(item_path))
             else:
-                logger.warning(f"File disappeared or bad file handle: {item_path}")
+                logger.warning("File disappeared or bad file handle: %s", item_path)
 
         return directory_contents
 
@@ -100,14 +100,14 @@ class DirNode(INode):
         - bool: True if the directory was successfully copied, False otherwise.
         """
         if os.path.exists(destination_dir):
-            logger.error(f"Destination directory {destination_dir} already exists.")
+            logger.error("Destination directory %s already exists.", destination_dir)
             return False
 
         try:
             shutil.copytree(self.path, destination_dir)
             return True
         except Exception as e:
-            logger.error(f"Failed to copy {self.path} to {destination_dir}: {str(e)}")
+            logger.error("Failed to copy %s to %s: %s", self.path, destination_dir, e)
             return False
 
     def remove(self, files_to_keep: List[str]) -> bool:
@@ -130,5 +130,5 @@ class DirNode(INode):
                         shutil.rmtree(inode.path)
             return True
         except Exception as e:
-            logger.error(f"Failed to delete files and directories from {self.path}. Reason: {str(e)}")
+            logger.error("Failed to delete files and directories from %s. Reason: %s", self.path, e)
             return False
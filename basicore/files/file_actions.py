@@ -1,10 +1,16 @@
 import os
+import re
 import json
+import errno
+import orjson
 import logging
 from pathlib import Path
 from typing import Union
 logger = logging.getLogger(__name__)
 
+# A run of 19 digits may be an integer wider than 64 bits, which orjson.loads turns into a float; json keeps it exact
+_WIDE_INT = re.compile(rb'\d{19}')
+
 
 class FileActions:
 
@@ -44,9 +50,11 @@ class FileActions:
         Returns:
             None
         """
-        if os.path.exists(filepath):
-            os.remove(filepath)
-        logger.info(f"File removed: {filepath}")
+        try:
+            os.unlink(filepath)
+        except FileNotFoundError:
+            pass
+        logger.info("File removed: %s", filepath)
 
     @classmethod
     def read(cls, filepath: str) -> Union[str, list, dict]:
@@ -62,12 +70,19 @@ class FileActions:
             IOError: If an error occurs while reading the file.
         """
         try:
-            with open(filepath, "r") as f:
+            with open(filepath, "rb") as f:
                 content = f.read()
+            if _WIDE_INT.search(content) is None:
+                try:
+                    return orjson.loads(content)  # Try parsing as JSON dict or list, straight from bytes
+                except orjson.JSONDecodeError:
+                    pass
+            # json also parses NaN, Infinity and numbers beyond a double's range, which orjson rejects
+            text = content.decode().replace("\r\n", "\n").replace("\r", "\n")
             try:
-                return json.loads(content)  # Try parsing as JSON dict or list
+                return json.loads(text)
             except json.JSONDecodeError:
-                return content  # Return as plain text if parsing fails
+                return text  # Return as plain text if parsing fails, with newlines normalised as in text mode
         except IOError as e:
             raise IOError(f"Failed to read {filepath}: {str(e)}")
 
@@ -87,17 +102,21 @@ class FileActions:
             PermissionError: If write permission is not granted.
             IOError: If an error occurs while writing to the file.
         """
-        p = Path(filepath)
-        if not p.exists():
-            p.parent.mkdir(parents=True, exist_ok=True)
+        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
 
         try:
             if isinstance(data, (list, dict)):
-                data = json.dumps(data)
-
-            file_path = filepath if not p.is_symlink() else os.readlink(filepath)
-            with open(file_path, mode) as f:
-                f.write(data)
+                try:
+                    buf = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+                except orjson.JSONEncodeError:
+                    # orjson rejects integers wider than 64 bits and some types json handles
+                    buf = json.dumps(data).encode()
+            else:
+                buf = data.encode() if isinstance(data, str) else data
+
+            # open() follows symlinks itself, so there is no need to resolve them here
+            with open(filepath, mode if "b" in mode else f"{mode}b") as f:
+                f.write(buf)
         except PermissionError as e:
             raise PermissionError(f"Cannot write to {filepath}: Write permission is not granted.")
         except IOError as e:
@@ -118,15 +137,19 @@ class FileActions:
             FileNotFoundError: If the symlink does not exist.
             ValueError: If the provided path is not a symlink.
         """
-        if not os.path.exists(symlink_path):
+        # readlink alone tells a missing path (ENOENT) from a non-symlink (EINVAL)
+        try:
+            os.readlink(symlink_path)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Symlink does not exist: {symlink_path}")
+        except OSError as e:
+            if e.errno == errno.EINVAL:
+                raise ValueError(f"The provided path {symlink_path} is not a symlink.")
+            raise
 
-        if not os.path.islink(symlink_path):
-            raise ValueError(f"The provided path {symlink_path} is not a symlink.")
-
-        symlink_target_path = os.readlink(symlink_path)
+        symlink_target_path = os.path.realpath(symlink_path)
         if os.path.exists(symlink_target_path):
-            return os.path.abspath(symlink_target_path)
+            return symlink_target_path
         else:
-            logger.warning(f"Broken symbolic link detected: {symlink_path}")
+            logger.warning("Broken symbolic link detected: %s", symlink_path)
             return ""
\ No newline at end of file
@@ -71,10 +71,10 @@ class FileNode(INode):
 
         try:
             os.remove(self.path)
-            logger.info(f"File removed: {self.path}")
+            logger.info("File removed: %s", self.path)
             return True
         except IOError as e:
-            logger.error(f"Failed to remove {self.path}: {str(e)}")
+            logger.error("Failed to remove %s: %s", self.path, e)
             raise IOError(f"Failed to remove {self.path}: {str(e)}")
 
     def is_size_greater(self, amount: float, unit: str = "B") -> bool:
@@ -127,7 +127,7 @@ class FileNode(INode):
             except json.JSONDecodeError:
                 return content  # Return as plain text if parsing fails
         except IOError as e:
-            logger.error(f"Failed to read {self.path}: {str(e)}")
+            logger.error("Failed to read %s: %s", self.path, e)
             raise IOError(f"Failed to read {self.path}: {str(e)}")
 
     def write(self, data: Union[str, list, dict], mode: str = "w") -> bool:
@@ -156,9 +156,9 @@ class FileNode(INode):
             with open(file_path, mode) as f:
                 f.write(data)
 
-            logger.info(f"Data written to file: {self.path}")
+            logger.info("Data written to file: %s", self.path)
             self._update_attributes()
             return True
         except IOError as e:
-            logger.error(f"Failed to write data to {self.path}: {str(e)}")
+            logger.error("Failed to write data to %s: %s", self.path, e)
             raise IOError(f"Failed to write data to {self.path}: {str(e)}")
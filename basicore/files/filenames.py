@@ -17,8 +17,9 @@ class Filenames:
         Returns:
             list[str]: A list containing the directory, filename, and extension components.
         """
-        directory = directory if directory else os.path.dirname(filepath)
-        filename, file_ext = os.path.splitext(os.path.basename(filepath))
+        head, tail = os.path.split(filepath)
+        directory = directory if directory else head
+        filename, file_ext = os.path.splitext(tail)
         file_ext = file_ext if file_ext else ""
         return [directory, filename, file_ext]
 
@@ -99,15 +100,16 @@ class Filenames:
             str: A unique filename.
         """
         directory, filename, file_ext = Filenames._breakdown(filepath, directory)
-        filepath = os.path.join(directory, filename + file_ext)
 
-        current_suffix: int = 0
-        new_filepath = Filenames.enumerate(filepath=filepath, count=current_suffix, directory=directory,
-                                           delim=delim, digits=digits)
+        # List the directory once and probe candidates in memory rather than stat'ing each one
+        try:
+            with os.scandir(directory or ".") as entries:
+                existing = {entry.name for entry in entries}
+        except FileNotFoundError:
+            existing = set()
 
-        # Loop until a unique filename is found
-        while os.path.exists(new_filepath):
+        # Loop until a unique filename is found, breaking the path down only once
+        current_suffix: int = 0
+        while (new_filename := f"{filename}{delim}{current_suffix:0{digits}}{file_ext}") in existing:
             current_suffix += 1
-            new_filepath = Filenames.enumerate(filepath=filepath, count=current_suffix, directory=directory,
-                                               delim=delim, digits=digits)
-        return new_filepath
+        return os.path.join(directory, new_filename)
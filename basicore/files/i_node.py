@@ -105,4 +105,4 @@ class INode(Basic):
                 self.symlink_target = ""  if self.exists else None
 
         except PermissionError as e:
-            logger.error(f"Permission denied: {str(e)}")
+            logger.error("Permission denied: %s", e)
@@ -76,24 +76,24 @@ class APITask(UTask):
         try:
             async with aiohttp.ClientSession(auth=auth, headers=headers) as session:
 
-                logging.info(f"request: {self.request}")
+                logger.info("request: %s", self.request)
                 async with session.post(
                         self.api_url,
                         json=self.request,
                 ) as response:
 
                     self.response = await response.json()
-                    logging.info(f"response: {self.response}")
+                    logger.info("response: %s", self.response)
 
         except aiohttp.ClientConnectionError as e:
-            logging.error(f"Connection error occurred: {e}")
+            logger.error("Connection error occurred: %s", e)
             raise
         except aiohttp.ClientResponseError as e:
-            logging.error(f"Response error occurred: {e}")
+            logger.error("Response error occurred: %s", e)
             raise
         except aiohttp.ClientPayloadError as e:
-            logging.error(f"Payload error occurred: {e}")
+            logger.error("Payload error occurred: %s", e)
             raise
         except json.JSONDecodeError as e:
-            logging.error(f"Error decoding JSON data: {e}")
+            logger.error("Error decoding JSON data: %s", e)
             raise
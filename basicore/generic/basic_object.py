@@ -1,7 +1,6 @@
 import logging
 
 __all__ = ['Basic']
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class Basic:
@@ -14,8 +13,16 @@ class Basic:
     _bool_fail(msg: str) -> bool:
         Logs an error message and returns False.
     """
+    __slots__ = ()
+    logger = logging.getLogger(__qualname__)
+
+    def __init_subclass__(cls, **kwargs):
+        # Resolve the per-class logger once at class creation rather than on every instantiation
+        super().__init_subclass__(**kwargs)
+        cls.logger = logging.getLogger(cls.__name__)
+
     def __init__(self, **kwargs):
-        self.logger = logging.getLogger(self.__class__.__name__)
+        pass
 
     def _bfail(self, info: str = "", error: str = "") -> bool:
         """
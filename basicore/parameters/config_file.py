@@ -1,12 +1,65 @@
 import os
 import json
-import configparser
 import logging
+import threading
+import configparser
+from collections import OrderedDict
 
 __all__ = ['ConfigReader']
-logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
+# Lookups for ConfigReader.get's type coercion. A JSON document can only start with one of _JSON_STARTS or be one of
+# the bare _JSON_CONSTANTS, ignoring surrounding JSON whitespace.
+_BOOLEANS = {'true': True, 'false': False}
+_JSON_WHITESPACE = ' \t\n\r'
+_JSON_STARTS = frozenset('{["-0123456789')
+_JSON_CONSTANTS = frozenset(('null', 'true', 'false', 'NaN', 'Infinity'))
+
+
+def _parse_ini(text: str, filepath: str) -> dict:
+    """
+    Parse INI text with configparser into {section: {key: value}}, with DEFAULT keys and interpolation applied.
+
+    Raises:
+    configparser.Error: If the text is not valid INI or a value cannot be interpolated.
+    """
+    config = configparser.ConfigParser()
+    config.read_string(text, source=filepath)
+    return {section: dict(config.items(section)) for section in config.sections()}
+
+
+# Parsed files keyed by absolute path, each stored with the (st_mtime_ns, st_size) it was parsed at. Entries are kept
+# in least-recently-used order, and a changed file no longer matches its entry so it is parsed again.
+_PARSED: 'OrderedDict[str, tuple]' = OrderedDict()
+_PARSED_MAXSIZE = 100
+_PARSED_LOCK = threading.Lock()
+
+
+def _load_ini(filepath: str) -> dict:
+    """
+    Return the parsed sections of an INI file, reusing the previous parse while the file is unchanged.
+
+    The returned dictionaries are shared between callers and must not be modified.
+    """
+    path = os.path.abspath(filepath)
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _PARSED_LOCK:
+        entry = _PARSED.get(path)
+        if entry is not None and entry[0] == version:
+            _PARSED.move_to_end(path)
+            return entry[1]
+
+    with open(path, 'r') as f:
+        sections = _parse_ini(f.read(), filepath)
+
+    with _PARSED_LOCK:
+        _PARSED[path] = (version, sections)
+        _PARSED.move_to_end(path)
+        if len(_PARSED) > _PARSED_MAXSIZE:
+            _PARSED.popitem(last=False)
+    return sections
+
 
 class ConfigReader:
     """
@@ -51,28 +104,19 @@ class ConfigReader:
         dict
             a dictionary that contains the configuration data
         """
-        # Open the file and print its contents
-        lines = ""
-        with open(self.filepath, 'r') as f:
-            lines = f.read()
-
-
-        config = configparser.ConfigParser()
         config_dict = {}
+        # Variables are looked up live rather than from a copy of os.environ: copying the whole environment costs
+        # more than the handful of lookups a configuration file needs
+        getenv = os.environ.get
         try:
-            config.read(self.filepath)
-
-            for section in config.sections():
-                config_dict[section] = {}
-                for key, value in config.items(section):
-                    env_value = os.getenv(f"{section}_{key}".upper())
-                    if env_value is not None:
-                        config_dict[section][key] = env_value
-                    else:
-                        config_dict[section][key] = value
-
+            sections = _load_ini(self.filepath)
         except configparser.Error as e:
-            logging.error(f'Error reading configuration file: {e}')
+            logger.error('Error reading configuration file: %s', e)
+            return config_dict
+
+        for section, values in sections.items():
+            prefix = f"{section}_".upper()
+            config_dict[section] = {key: getenv(prefix + key.upper(), value) for key, value in values.items()}
 
         return config_dict
 
@@ -98,14 +142,13 @@ class ConfigReader:
             if value.isdigit():
                 # If the string contains only digits, cast it to an integer
                 value = int(value)
-            elif value.lower() == 'true':
-                # If the string is 'true' (case-insensitive), cast it to a boolean True
-                value = True
-            elif value.lower() == 'false':
-                # If the string is 'false' (case-insensitive), cast it to a boolean False
-                value = False
-            else:
-                # Check if the string is a valid JSON-formatted dictionary or list
+            elif (lowered := value.lower()) in _BOOLEANS:
+                # If the string is 'true' or 'false' (case-insensitive), cast it to a boolean
+                value = _BOOLEANS[lowered]
+            elif value.lstrip(_JSON_WHITESPACE)[:1] in _JSON_STARTS or \
+                    value.strip(_JSON_WHITESPACE) in _JSON_CONSTANTS:
+                # Check if the string is a valid JSON value. Strings that cannot start one are left as they are
+                # without raising and catching a decode error.
                 try:
                     value = json.loads(value)
                 except json.JSONDecodeError:
@@ -123,13 +166,6 @@ class ConfigReader:
         str
             a string that represents the configuration dictionary in INI format
         """
-
-        config = configparser.ConfigParser()
-        config.read_dict(self.config_dict)
-        output = []
-        for section in config.sections():
-            output.append(f'[{section}]')
-            for key, val in config.items(section):
-                output.append(f'{key} = {val}')
-            output.append('')
-        return '\n'.join(output)
+        # Rendered straight from the dictionary rather than round-tripped through a ConfigParser
+        return '\n'.join(f'[{section}]\n' + ''.join(f'{key} = {val}\n' for key, val in values.items())
+                         for section, values in self.config_dict.items())
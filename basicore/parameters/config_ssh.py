@@ -1,10 +1,8 @@
 import os
-import configparser
 import logging
 from .config_file import ConfigReader
 
 __all__ = ['SSHConfig']
-logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
 
@@ -12,6 +10,10 @@ class SSHConfig:
     """
     A class representing SSH configuration.
     """
+    __slots__ = ('remote_server', 'ssh_user', 'ssh_pswd', 'ssh_port', 'remote_dir', '_pool_key')
+
+    # The fields that identify an SSH account; the password is left out so it never ends up in a dict key
+    POOL_KEY_FIELDS = ('remote_server', 'ssh_port', 'ssh_user')
 
     def __init__(self, remote_server: str = None, ssh_user: str = None, ssh_pswd: str = None, ssh_port: str = None,
                  remote_dir: str = None, config_file: str = None):
@@ -26,17 +28,40 @@ class SSHConfig:
             remote_dir (str, optional): The path to the SSH source_dir. Defaults to None.
             config_file (str, optional): The path to the configuration file. Defaults to None.
         """
-        # Set default values from environment variables
-        self.remote_server = remote_server or os.getenv('REMOTE_SERVER')
-        self.ssh_user = ssh_user or os.getenv('SSH_USER')
-        self.ssh_pswd = ssh_pswd or os.getenv('SSH_PSWD')
-        self.ssh_port = ssh_port or os.getenv('SSH_PORT')
-        self.remote_dir = remote_dir or os.getenv('SSH_DIR')
+        self._pool_key = None
+
+        # Set default values from environment variables, read live so variables set after import are honoured
+        environ = os.environ
+        self.remote_server = remote_server or environ.get('REMOTE_SERVER')
+        self.ssh_user = ssh_user or environ.get('SSH_USER')
+        self.ssh_pswd = ssh_pswd or environ.get('SSH_PSWD')
+        self.ssh_port = ssh_port or environ.get('SSH_PORT')
+        self.remote_dir = remote_dir or environ.get('SSH_DIR')
 
         # Override defaults with values from config file, if provided
         if config_file:
             self.load_config(config_file)
 
+    def __setattr__(self, name, value):
+        """
+        Set an attribute, dropping the cached pool key when one of the fields it is built from changes.
+        """
+        object.__setattr__(self, name, value)
+        if name in SSHConfig.POOL_KEY_FIELDS:
+            object.__setattr__(self, '_pool_key', None)
+
+    @property
+    def pool_key(self) -> tuple:
+        """
+        The key under which connections for this configuration are pooled, built once and reused.
+
+        Returns:
+            tuple: The (remote_server, ssh_port, ssh_user) of the configuration.
+        """
+        if self._pool_key is None:
+            self._pool_key = (self.remote_server, self.ssh_port, self.ssh_user)
+        return self._pool_key
+
     def __repr__(self):
         """
         Returns a string representation of the SSHConfig instance.
@@ -44,14 +69,8 @@ class SSHConfig:
         Returns:
             str: A string representation of the SSHConfig instance.
         """
-        retstr = "SSHConfig("
-        retstr += f"remote_server={self.remote_server}," if hasattr(self, 'remote_server') else ""
-        retstr += f"ssh_user={self.ssh_user}," if hasattr(self, 'ssh_user') else ""
-        retstr += f"ssh_pswd=<private>," if hasattr(self, 'ssh_pswd') else ""
-        retstr += f"ssh_port={self.ssh_port}," if hasattr(self, 'ssh_port') else ""
-        retstr += f"remote_dir={self.remote_dir}" if hasattr(self, 'remote_dir') else ""
-        retstr += ")"
-        return retstr
+        return f"SSHConfig(remote_server={self.remote_server},ssh_user={self.ssh_user},ssh_pswd=<private>," \
+               f"ssh_port={self.ssh_port},remote_dir={self.remote_dir})"
 
     def load_config(self, config_file: str) -> None:
         """
@@ -70,7 +89,7 @@ class SSHConfig:
             self.ssh_pswd = config.get('SSH', 'ssh_pswd', "")
             self.ssh_port = config.get('SSH', 'ssh_port', "")
             self.remote_dir = config.get('SSH', 'remote_dir', "")
-            logging.info('SSH configuration loaded from config file.')
-        except (configparser.Error, IOError) as e:
-            logging.error(f'Error loading configuration file {config_file}: {e}')
+            logger.info('SSH configuration loaded from config file.')
+        except (OSError, ValueError) as e:
+            logger.error('Error loading configuration file %s: %s', config_file, e)
             raise Exception(f'Error loading configuration file {config_file}: {e}') from e
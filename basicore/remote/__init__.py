@@ -1,3 +1,5 @@
+from .ssh_pool import SSHConnectionPool
+from .path_cache import RemotePathCache
 from .remote_command import RemoteCommand, RemoteResults, RemoteConnection, RemoteExecuteException
 from .remote_dir_actions import RemoteDirActions
 from .remote_file_actions import RemoteFileActions
@@ -0,0 +1,135 @@
+import time
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Tuple
+
+if TYPE_CHECKING:
+    from .remote_command import RemoteConnection
+
+__all__ = ['RemotePathCache', 'CachedPathActions']
+
+
+class RemotePathCache:
+    """
+    A small thread-safe cache of remote path lookups, keyed by (account, operation, path).
+
+    Entries older than the ttl passed to get() are treated as missing. Once maxsize entries are held, the oldest
+    entry is dropped to make room for a new one.
+
+    Attributes:
+    maxsize (int): The maximum number of cached entries.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize a RemotePathCache instance.
+
+        Args:
+        maxsize (int, optional): The maximum number of cached entries. Defaults to 1024.
+        """
+        self.maxsize = maxsize
+        self._entries: Dict[Tuple[Hashable, str, str], Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Hashable, str, str], ttl: float) -> Tuple[bool, Any]:
+        """
+        Look up a cached value.
+
+        Args:
+        key (Tuple[Hashable, str, str]): The (account, operation, path) key.
+        ttl (float): Seconds a cached value stays valid.
+
+        Returns:
+        Tuple[bool, Any]: (True, value) on a fresh hit, (False, None) otherwise.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return True, entry[1]
+        return False, None
+
+    def put(self, key: Tuple[Hashable, str, str], value: Any) -> None:
+        """
+        Cache a value.
+
+        Args:
+        key (Tuple[Hashable, str, str]): The (account, operation, path) key.
+        value (Any): The value to cache.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxsize:
+                # Dicts keep insertion order, so the first key is the oldest entry
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic(), value)
+
+    def invalidate(self, account: Hashable, path: str) -> None:
+        """
+        Drop the cached lookups a change to path can affect: path itself, everything below it and its parent.
+
+        Args:
+        account (Hashable): The account the path belongs to.
+        path (str): The path that changed.
+        """
+        path = path.rstrip('/') or '/'
+        parent = path.rsplit('/', 1)[0] or '/'
+        below = path if path.endswith('/') else f"{path}/"
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == account]:
+                cached = key[2].rstrip('/') or '/'
+                if cached in (path, parent) or cached.startswith(below):
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        """
+        Drop every cached entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CachedPathActions:
+    """
+    Base for remote action classes whose lookups can be cached for cache_ttl seconds per (account, path).
+
+    Every subclass shares one RemotePathCache, so a change made through one class drops the entries any of them
+    cached for the affected paths. Caching is off while cache_ttl is 0, which is the default, since other processes
+    may change the remote file system at any time.
+
+    Attributes:
+        cache_ttl (float): Seconds a cached lookup stays valid. Defaults to 0 (no caching).
+    """
+    cache_ttl = 0.0
+    _cache = RemotePathCache()
+
+    @classmethod
+    def _cached(cls, operation: str, path: str, ssh: 'RemoteConnection', lookup: Callable[[], Any]) -> Any:
+        """
+        Return the cached result of a lookup when caching is on and the entry is fresh, otherwise run and cache it.
+        """
+        if cls.cache_ttl <= 0:
+            return lookup()
+        key = (ssh.authentication.pool_key, operation, path)
+        hit, value = cls._cache.get(key, cls.cache_ttl)
+        if not hit:
+            value = lookup()
+            cls._cache.put(key, value)
+        # Listings are mutable dicts, so callers get their own copy
+        return dict(value) if isinstance(value, dict) else value
+
+    @classmethod
+    def _invalidate(cls, path: str, ssh: 'RemoteConnection') -> None:
+        """
+        Drop the cached lookups a change to path can affect, whichever class cached them.
+        """
+        if len(cls._cache):
+            cls._cache.invalidate(ssh.authentication.pool_key, path)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """
+        Drop every cached lookup.
+        """
+        cls._cache.clear()
@@ -1,15 +1,49 @@
-import time
-import json
+import os
+import re
+import mmap
+import stat
+import uuid
+import shlex
+import select
+import shutil
+import orjson
 import socket
+import tarfile
 import logging
-import paramiko
-from scp import SCPClient
-from dataclasses import dataclass
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterator, List, Tuple
 from basicore.parameters.config_ssh import SSHConfig
+from .ssh_pool import SSHConnectionPool
+
+if TYPE_CHECKING:
+    import paramiko
 
 __all__ = ['RemoteCommand', 'RemoteResults', 'RemoteConnection', 'RemoteExecuteException']
-logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
+_ERROR_NEEDLE = "error"
+_ERROR_SCAN_CHUNK = 1 << 16
+
+
+def _contains_error(text: str) -> bool:
+    """
+    Case-insensitively check whether text contains "error".
+
+    The text is lowered one chunk at a time: str.lower() has an ASCII fast path that beats an IGNORECASE regex
+    several times over, and chunking keeps the lowered copy to _ERROR_SCAN_CHUNK characters however large the
+    output is. Consecutive chunks overlap so a match spanning a boundary is still found.
+
+    Args:
+    text (str): The text to search.
+
+    Returns:
+    bool: True if the text contains "error" in any case.
+    """
+    overlap = len(_ERROR_NEEDLE) - 1
+    for start in range(0, len(text), _ERROR_SCAN_CHUNK):
+        if _ERROR_NEEDLE in text[max(start - overlap, 0):start + _ERROR_SCAN_CHUNK].lower():
+            return True
+    return False
 
 
 class RemoteExecuteException(Exception):
@@ -23,10 +57,9 @@ class RemoteExecuteException(Exception):
         return f'Remote execution error: {self.message}'
 
 
-@dataclass
 class RemoteResults:
     """
-    A dataclass for storing the results of a command executed on a remote server.
+    A class for storing the results of a command executed on a remote server.
 
     Attributes:
     command (str): The command that was executed.
@@ -39,17 +72,12 @@ class RemoteResults:
     completion (bool): Whether the command has completed execution. Initialized as False.
     stdin (str): The standard input for the command. Initialized as an empty string.
     """
-    command: str
-    command_id: str
-    stdin: str = ""
-    stdout: str = ""
-    stderr: str = ""
-    exit_code: int = -1
-    completion: bool = False
-    success: bool = False
-    errors: bool = False
-
-    def __init__(self, **kwargs):
+    __slots__ = ("command", "command_id", "stdin", "stdout", "stderr", "exit_code", "completion", "success", "errors")
+
+    REPR_OUTPUT_LIMIT = 256
+
+    def __init__(self, command: str = "", command_id: str = "", stdin: str = "", stdout: str = "", stderr: str = "",
+                 exit_code: int = -1, completion: bool = False, success: bool = False, errors: bool = False):
         """
         Initialize a RemoteResults instance.
 
@@ -57,16 +85,30 @@ class RemoteResults:
         command (str): The command that was executed. Defaults to an empty string.
         command_id (str): An identifier for the command. Defaults to an empty string.
         """
-        self.__dict__.update(**kwargs)
+        self.command = command
+        self.command_id = command_id
+        self.stdin = stdin
+        self.stdout = stdout
+        self.stderr = stderr
+        self.exit_code = exit_code
+        self.completion = completion
+        self.success = success
+        self.errors = errors
 
     def __repr__(self) -> str:
         """
         Generate a string representation of the RemoteResults instance.
+        stdout and stderr are truncated to REPR_OUTPUT_LIMIT characters so logging a result stays cheap.
 
         Returns:
         str: A string representation of the RemoteResults instance.
         """
-        return f"RemoteResults({json.dumps(self.__dict__)})"
+        state = {name: getattr(self, name) for name in RemoteResults.__slots__}
+        for name in ("stdout", "stderr"):
+            value = state[name]
+            if value and len(value) > RemoteResults.REPR_OUTPUT_LIMIT:
+                state[name] = f"{value[:RemoteResults.REPR_OUTPUT_LIMIT]}...<{len(value)} chars>"
+        return f"RemoteResults({orjson.dumps(state).decode()})"
 
     def add_to_stderr(self, msg: str = "") -> None:
         """
@@ -77,7 +119,7 @@ class RemoteResults:
         """
         self.stderr = f"{self.stderr}\n >{msg}" if self.stderr else msg
 
-    def determine_states(self, completion: bool = False) -> None:
+    def determine_states(self, completion: bool = False, scan_errors: bool = True) -> None:
         """
         Check the stdout and stderr for errors and update the status attributes.
 
@@ -87,15 +129,19 @@ class RemoteResults:
 
         Args:
         completion (bool): Whether the command has completed execution. Defaults to False.
+        scan_errors (bool): Whether "error" anywhere in stdout or stderr counts as an error. Pass False for
+                            machine-readable output, such as paths, so success rests on the exit status alone.
+                            Defaults to True.
         """
         self.completion = completion
 
-        self.errors = "ERROR" in self.stdout.upper() or "ERROR" in self.stderr.upper()
+        self.errors = scan_errors and (_contains_error(self.stdout) or _contains_error(self.stderr))
+        # Results are passed to the logger unformatted, so their repr is only built if the record is emitted
         if self.errors:
-            logger.info(f"Command failure detected: {self}")
+            logger.info("Command failure detected: %s", self)
 
         if self.errors or not self.completion or self.exit_code != 0:
-            logger.info(f"Command exited with error status: {self}")
+            logger.info("Command exited with error status: %s", self)
             self.success = False
         else:
             #logger.info(f"{self.command_id}: Command completed successfully.")
@@ -106,12 +152,19 @@ class RemoteConnection:
     """
     A class to establish and manage a connection to a remote server using SSH.
 
+    Clients are checked out of a process-wide SSHConnectionPool and handed back to it on close() (or when the
+    RemoteConnection is garbage collected), so consecutive connections to the same account reuse one SSH session
+    instead of repeating the key exchange and authentication.
+
     Attributes:
     client (Optional[paramiko.SSHClient]): The SSH client. Initialized as None.
+    transport (Optional[paramiko.Transport]): The client's transport, cached when the client is checked out.
+    sftp (Optional[paramiko.SFTPClient]): The SFTP session opened by open_sftp(). Initialized as None.
+    shell (Optional[paramiko.Channel]): The shell channel opened by open_shell(). Initialized as None.
     authentication (SSHConfig): The SSH authentication configuration.
     """
-    client: paramiko.SSHClient = None
-    authentication: SSHConfig = None
+    __slots__ = ('client', 'transport', 'sftp', 'shell', 'authentication')
+    pool = SSHConnectionPool()
 
     def __init__(self, authentication: SSHConfig):
         """
@@ -120,50 +173,166 @@ class RemoteConnection:
         Args:
         authentication (SSHConfig): The SSH authentication configuration.
         """
-        self.authentication = authentication
+        self.client: 'paramiko.SSHClient' = None
+        self.transport: 'paramiko.Transport' = None
+        self.sftp: 'paramiko.SFTPClient' = None
+        self.shell: 'paramiko.Channel' = None
+        self.authentication: SSHConfig = authentication
         self.connect()
 
     def __del__(self) -> None:
         """
         Clean up when the RemoteConnection instance is being destroyed.
-        If the client attribute is not None, the SSH connection is closed.
+        If the client attribute is not None, the SSH client is returned to the pool.
         """
-        if self.client is not None:
-            self.client.close()
+        self.close()
 
     def connect(self) -> str:
         """
-        Connect to the remote server using SSH.
+        Connect to the remote server using SSH, reusing a pooled client when one is idle.
 
         Returns:
         str: Returns an error message string if any error occurred, else returns an empty string.
         """
+        if self.client is not None:
+            return ""
+
+        # paramiko pulls in cryptography's C extensions, so it is only imported once a connection is needed
+        import paramiko
+
         try:
-            if self.client is None:
-                self.client = paramiko.SSHClient()
-                self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                self.client.connect(
-                    self.authentication.remote_server,
-                    port=self.authentication.ssh_port,
-                    username=self.authentication.ssh_user,
-                    password=self.authentication.ssh_pswd
-                )
+            self.client = RemoteConnection.pool.get(self.authentication)
+            self.transport = self.client.get_transport()
         except paramiko.AuthenticationException as e:
-            self.client = None
             return f"ERROR: Failed to log in to remote server. {self.authentication}. {str(e)}"
         return ""
 
+    def open_sftp(self) -> 'paramiko.SFTPClient':
+        """
+        Return this connection's SFTP session, opening it on first use so later transfers reuse one channel.
+
+        Returns:
+        paramiko.SFTPClient: The SFTP session.
+        """
+        if self.sftp is None:
+            self.sftp = self.client.open_sftp()
+        return self.sftp
+
+    def open_channel(self, timeout: float = None) -> 'paramiko.Channel':
+        """
+        Open a new session channel on this connection's transport. Channels are multiplexed over the one SSH
+        session, so this costs a single round trip rather than a new key exchange and authentication.
+
+        Args:
+        timeout (float, optional): Seconds to wait for the server to open the channel. Defaults to None.
+
+        Returns:
+        paramiko.Channel: The new channel.
+        """
+        return self.transport.open_session(timeout=timeout)
+
+    def open_shell(self) -> 'paramiko.Channel':
+        """
+        Return this connection's shell channel, starting a non-interactive /bin/sh on first use.
+        The shell keeps running between batches, so its working directory and environment carry over.
+
+        Returns:
+        paramiko.Channel: The channel whose stdin feeds the shell.
+        """
+        if self.shell is None or self.shell.closed:
+            self.shell = self.open_channel()
+            self.shell.exec_command("/bin/sh")
+        return self.shell
+
+    def close_shell(self) -> None:
+        """
+        Close this connection's shell channel, if one is open.
+        """
+        if self.shell is not None:
+            self.shell.close()
+            self.shell = None
+
+    def close(self) -> None:
+        """
+        Close this connection's shell and SFTP session and return its SSH client to the pool.
+        """
+        self.close_shell()
+        if self.sftp is not None:
+            self.sftp.close()
+            self.sftp = None
+        if self.client is not None:
+            RemoteConnection.pool.release(self.authentication, self.client)
+            self.client = None
+            self.transport = None
+
+    @classmethod
+    def close_all(cls) -> None:
+        """
+        Close every idle pooled SSH client. Clients still held by open RemoteConnections are not affected.
+        """
+        cls.pool.close_all()
+
 
 class RemoteCommand:
     """
     A class providing utility methods to execute commands and transfer files on a remote server via SSH.
     """
-    INIT_WAIT_TIME = 1
-    LOOP_WAIT_TIME = 5
+    RECV_SIZE = 65536
+    COPY_BUFSIZE = 1 << 20
+
+    @staticmethod
+    def _strip_lines(output: bytes) -> str:
+        """
+        Decode raw channel output and strip surrounding whitespace from each of its lines.
+
+        Args:
+        output (bytes): The raw output.
+
+        Returns:
+        str: The decoded output, with each line stripped of surrounding whitespace.
+        """
+        return "\n".join(line.strip() for line in output.decode(errors="replace").splitlines())
+
+    @classmethod
+    def _drain(cls, channel: 'paramiko.Channel', timeout: float = None) -> Tuple[bytearray, bytearray]:
+        """
+        Read a channel's stdout and stderr as data arrives until the remote side sends EOF.
+
+        Both streams share the channel's flow-control window, so reading them together keeps a command that writes
+        heavily to stderr from stalling while stdout is still being read.
+
+        Args:
+        channel (paramiko.Channel): The channel the command runs on.
+        timeout (float, optional): Seconds to wait for more output before giving up. Defaults to None (no limit).
+
+        Returns:
+        Tuple[bytearray, bytearray]: The raw stdout and stderr.
+
+        Raises:
+        socket.timeout: If no output or EOF arrives within timeout seconds.
+        """
+        stdout, stderr = bytearray(), bytearray()
+        while True:
+            # Sample EOF before reading: output that precedes it is already buffered when it is seen
+            eof = channel.eof_received or channel.closed
+            received = False
+            if channel.recv_ready():
+                stdout += channel.recv(cls.RECV_SIZE)
+                received = True
+            if channel.recv_stderr_ready():
+                stderr += channel.recv_stderr(cls.RECV_SIZE)
+                received = True
+            if received:
+                continue
+            if eof:
+                return stdout, stderr
+            if not select.select([channel], [], [], timeout)[0]:
+                raise socket.timeout(f"No output received within {timeout} seconds")
 
     @classmethod
     def execute(cls, command: str, command_id: str, ssh: RemoteConnection, bufsize: int = -1,
-                timeout: int = None, get_pty: bool = False, environment: dict = None) -> RemoteResults:
+                timeout: int = None, get_pty: bool = False, environment: dict = None,
+                strip_lines: bool = True, scan_errors: bool = True) -> RemoteResults:
         """
         Execute a command on the remote server.
 
@@ -171,15 +340,21 @@ class RemoteCommand:
         command (str): The command to be executed on the remote server.
         command_id (str): An identifier for the command.
         ssh (RemoteConnection): The SSH connection to the remote server.
-        bufsize (int, optional): The buffer size. Defaults to -1.
+        bufsize (int, optional): Unused; output is read straight from the channel. Kept for compatibility.
         timeout (int, optional): The timeout for the command in seconds. Defaults to None.
         get_pty (bool, optional): Whether to get a pseudo-terminal for the command. Defaults to False.
         environment (dict, optional): The environment variables for the command. Defaults to None.
+        strip_lines (bool, optional): Whether to strip surrounding whitespace from each line of stdout. Pass False for
+                                      machine-readable output, e.g. NUL-delimited paths. Defaults to True.
+        scan_errors (bool, optional): Whether "error" anywhere in the output fails the command. Pass False for
+                                      machine-readable output, e.g. paths, so success rests on the exit status
+                                      alone. Defaults to True.
 
         Returns:
         RemoteResults: An instance of RemoteResults containing the standard input, standard output, standard error, and
         exit status of the command.
         """
+        import paramiko
         results = RemoteResults(command=command, command_id=command_id)
         if (emsg := ssh.connect()) != "":
             results.add_to_stderr(emsg)
@@ -187,21 +362,99 @@ class RemoteCommand:
             return results
 
         try:
-            # Connect to remote server using SSH and Execute command
-            stdin, stdout, stderr = ssh.client.exec_command(command=command, bufsize=bufsize, timeout=timeout,
-                                                            get_pty=get_pty, environment=environment)
-            time.sleep(RemoteCommand.INIT_WAIT_TIME)
+            # Run the command on a fresh channel of the pooled transport, skipping exec_command's file wrappers
+            channel = ssh.open_channel(timeout=timeout)
+            try:
+                if get_pty:
+                    channel.get_pty()
+                channel.settimeout(timeout)
+                if environment:
+                    channel.update_environment(environment)
+                channel.exec_command(command)
+
+                # set in cli results. Both streams are read as output arrives until EOF (bounded by the timeout)
+                stdout, stderr = RemoteCommand._drain(channel, timeout)
+                results.stdout = RemoteCommand._strip_lines(stdout) if strip_lines else stdout.decode(errors="replace")
+                results.stderr = RemoteCommand._strip_lines(stderr)
+
+                # Wait for command to finish and capture its exit status, bounded by the same timeout as the reads
+                if not channel.status_event.wait(timeout):
+                    raise socket.timeout(f"No exit status received within {timeout} seconds")
+                results.exit_code = channel.recv_exit_status()
+                results.determine_states(completion=True, scan_errors=scan_errors)
+            finally:
+                # The pooled transport outlives this call, so the channel is closed however the command ends
+                channel.close()
 
-            # Wait for command to finish and capture its exit status
-            while not stdout.channel.exit_status_ready():
-                time.sleep(RemoteCommand.LOOP_WAIT_TIME)
+        except paramiko.SSHException as e:
+            results.add_to_stderr(f"ERROR: SSH error while waiting for command to finish: {str(e)}")
+            results.determine_states(completion=False)
+        except socket.timeout as e:
+            results.add_to_stderr(f"ERROR: Socket timed out while waiting for command to finish. {str(e)}")
+            results.determine_states(completion=False)
+        except socket.error as e:
+            results.add_to_stderr(f"ERROR: Socket error while waiting for command to finish: {str(e)}")
+            results.determine_states(completion=False)
 
-            # set in cli results
-            #results.stdin = stdin.read().decode().strip() if stdin else ""
-            results.stdout = "\n".join([line.strip() for line in stdout.readlines()]) if stdout else ""
-            results.stderr = "\n".join([line.strip() for line in stderr.readlines()]) if stderr else ""
-            results.exit_code = stdout.channel.recv_exit_status()
-            results.determine_states(completion=True)
+        return results
+
+    @classmethod
+    def stream(cls, results: RemoteResults, ssh: RemoteConnection, timeout: float = None) -> Iterator[bytes]:
+        """
+        Execute results.command on the remote server and yield its standard output as it arrives, so large output is
+        never held in memory at once.
+
+        Standard error, the exit status and the success states are filled into results once the output has been
+        read to the end. Closing the generator early closes the channel.
+
+        Args:
+        results (RemoteResults): The results to fill in; its command is the command executed.
+        ssh (RemoteConnection): The SSH connection to the remote server.
+        timeout (float, optional): Seconds to wait for more output or the exit status. Defaults to None (no limit).
+
+        Yields:
+        bytes: The next chunk of raw standard output, of at most RECV_SIZE bytes.
+        """
+        import paramiko
+        if (emsg := ssh.connect()) != "":
+            results.add_to_stderr(emsg)
+            results.determine_states(completion=False)
+            return
+
+        try:
+            channel = ssh.open_channel(timeout=timeout)
+            try:
+                channel.settimeout(timeout)
+                channel.exec_command(results.command)
+
+                # Both streams are read as data arrives, as in _drain, so standard error written while standard output
+                # is idle cannot fill the channel window
+                stderr = bytearray()
+                while True:
+                    eof = channel.eof_received or channel.closed
+                    received = False
+                    if channel.recv_stderr_ready():
+                        stderr += channel.recv_stderr(cls.RECV_SIZE)
+                        received = True
+                    if channel.recv_ready():
+                        chunk = channel.recv(cls.RECV_SIZE)
+                        received = True
+                        if chunk:
+                            yield chunk
+                    if received:
+                        continue
+                    if eof:
+                        break
+                    if not select.select([channel], [], [], timeout)[0]:
+                        raise socket.timeout(f"No output received within {timeout} seconds")
+
+                if not channel.status_event.wait(timeout):
+                    raise socket.timeout(f"No exit status received within {timeout} seconds")
+                results.stderr = RemoteCommand._strip_lines(stderr)
+                results.exit_code = channel.recv_exit_status()
+                results.determine_states(completion=True)
+            finally:
+                channel.close()
 
         except paramiko.SSHException as e:
             results.add_to_stderr(f"ERROR: SSH error while waiting for command to finish: {str(e)}")
@@ -213,16 +466,159 @@ class RemoteCommand:
             results.add_to_stderr(f"ERROR: Socket error while waiting for command to finish: {str(e)}")
             results.determine_states(completion=False)
 
-        return results
+    @classmethod
+    def execute_batch(cls, commands: List[str], command_id: str, ssh: RemoteConnection,
+                      timeout: float = None) -> List[RemoteResults]:
+        """
+        Execute several commands through the connection's persistent shell channel, paying one channel open
+        instead of one per command.
+
+        Each command runs with stdin redirected from /dev/null and is followed by a sentinel that carries its exit
+        status, which is used to split the shell's output back into per-command results. Commands must not exit the
+        shell; cd and exported variables persist into later commands and batches.
+
+        Args:
+        commands (List[str]): The commands to be executed on the remote server, in order.
+        command_id (str): An identifier for the batch. Each result gets command_id suffixed with its index.
+        ssh (RemoteConnection): The SSH connection to the remote server.
+        timeout (float, optional): Seconds to wait for more output before giving up. Defaults to None (no limit).
+
+        Returns:
+        List[RemoteResults]: One RemoteResults per command, in order.
+        """
+        import paramiko
+        batch = [RemoteResults(command=command, command_id=f"{command_id}_{index}")
+                 for index, command in enumerate(commands)]
+        if (emsg := ssh.connect()) != "":
+            for results in batch:
+                results.add_to_stderr(emsg)
+                results.determine_states(completion=False)
+            return batch
+
+        sentinel = f"__END_{uuid.uuid4().hex}__"
+        script = "".join(f"{{ {command}\n}} < /dev/null\n"
+                         f"printf '\\n{sentinel}%d\\n' $?; printf '\\n{sentinel}\\n' >&2\n" for command in commands)
+        marker = sentinel.encode()
+
+        try:
+            channel = ssh.open_shell()
+            channel.sendall(script.encode())
+
+            # Read both streams as data arrives until every command has reported on each of them
+            stdout, stderr = bytearray(), bytearray()
+            while stdout.count(marker) < len(commands) or stderr.count(marker) < len(commands):
+                if not select.select([channel], [], [], timeout)[0]:
+                    raise socket.timeout(f"No output received within {timeout} seconds")
+                received = False
+                if channel.recv_ready():
+                    stdout += channel.recv(RemoteCommand.RECV_SIZE)
+                    received = True
+                if channel.recv_stderr_ready():
+                    stderr += channel.recv_stderr(RemoteCommand.RECV_SIZE)
+                    received = True
+                if not received and (channel.eof_received or channel.closed):
+                    raise paramiko.SSHException("Remote shell exited before the batch completed")
+
+            outputs = re.split(rf"\n?{sentinel}(\d+)\n".encode(), stdout)
+            errors = re.split(rf"\n?{sentinel}\n".encode(), stderr)
+            for index, results in enumerate(batch):
+                results.stdout = RemoteCommand._strip_lines(outputs[2 * index])
+                results.exit_code = int(outputs[2 * index + 1])
+                results.stderr = RemoteCommand._strip_lines(errors[index])
+                results.determine_states(completion=True)
+            return batch
+
+        except paramiko.SSHException as e:
+            emsg = f"ERROR: SSH error while waiting for command to finish: {str(e)}"
+        except socket.timeout as e:
+            emsg = f"ERROR: Socket timed out while waiting for command to finish. {str(e)}"
+        except socket.error as e:
+            emsg = f"ERROR: Socket error while waiting for command to finish: {str(e)}"
+
+        # The shell's state is unknown after a failure, so start a fresh one next time
+        ssh.close_shell()
+        for results in batch:
+            results.add_to_stderr(emsg)
+            results.determine_states(completion=False)
+        return batch
+
+    @classmethod
+    def execute_many(cls, jobs: List[Tuple[str, str, SSHConfig]], timeout: float = None,
+                     max_workers: int = 32) -> List[RemoteResults]:
+        """
+        Executes commands on several remote servers concurrently, one command per job.
+
+        Each job runs on its own pooled connection in a worker thread; paramiko releases the GIL while it waits on
+        the network, so the wall-clock time is bounded by the slowest host rather than the sum over all hosts.
+
+        Args:
+        jobs (List[Tuple[str, str, SSHConfig]]): The (command, command_id, authentication) of each job.
+        timeout (float, optional): Seconds each command may take. Defaults to None (no timeout).
+        max_workers (int, optional): The maximum number of jobs run at once. Defaults to 32.
+
+        Returns:
+        List[RemoteResults]: The results of the jobs, in the same order as jobs.
+        """
+        import paramiko
+
+        def run(command: str, command_id: str, authentication: SSHConfig) -> RemoteResults:
+            try:
+                ssh = RemoteConnection(authentication)
+            except (paramiko.SSHException, socket.error) as e:
+                results = RemoteResults(command=command, command_id=command_id)
+                results.add_to_stderr(f"ERROR: Failed to connect to remote server. {authentication}. {str(e)}")
+                results.determine_states(completion=False)
+                return results
+            try:
+                return cls.execute(command, command_id, ssh, timeout=timeout)
+            finally:
+                ssh.close()
+
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            return list(executor.map(lambda job: run(*job), jobs))
+
+    @classmethod
+    def _sftp_put(cls, sftp: 'paramiko.SFTPClient', source: str, destination: str) -> None:
+        """
+        Upload a local file over SFTP in COPY_BUFSIZE chunks with pipelined writes.
+
+        The source is memory-mapped and handed to an unbuffered remote file as memoryview slices, so the file
+        contents are never copied into intermediate bytes objects on the local side.
+        """
+        with open(source, "rb") as local, sftp.open(destination, "wb", bufsize=0) as remote:
+            # Pipelining stops paramiko from waiting for an ack after every write request
+            remote.set_pipelined(True)
+            size = os.fstat(local.fileno()).st_size
+            if size == 0:
+                return
+            with mmap.mmap(local.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, cls.COPY_BUFSIZE):
+                        remote.write(view[offset:offset + cls.COPY_BUFSIZE])
+                finally:
+                    view.release()
+
+    @classmethod
+    def _sftp_get(cls, sftp: 'paramiko.SFTPClient', source: str, destination: str) -> None:
+        """
+        Download a remote file over SFTP in COPY_BUFSIZE chunks with read-ahead prefetching.
+        """
+        with sftp.open(source, "rb") as remote, open(destination, "wb") as local:
+            remote.prefetch()
+            shutil.copyfileobj(remote, local, cls.COPY_BUFSIZE)
 
     @classmethod
     def scp(cls, source: str, destination: str, ssh: RemoteConnection, put: bool = True) -> RemoteResults:
         """
-        Securely copies a file or directory from the source to the destination using SCP.
+        Securely copies a file from the source to the destination over the connection's SFTP session.
 
         Args:
-        source (str): The path to the source file or directory.
-        destination (str): The path to the destination file or directory.
+        source (str): The path to the source file.
+        destination (str): The path to the destination file, or an existing directory to copy the file into under
+                           its own name.
         ssh (RemoteConnection): The SSH connection to the remote server.
         put (bool, optional): If True, the source is the local path and the destination is the remote path (uploading).
                               If False, the source is the remote path and the destination is the local path (downloading).
@@ -234,6 +630,7 @@ class RemoteCommand:
         """
         command = f"scp {source} {destination}"
         command_id = "scp_put" if put else "scp_get"
+        import paramiko
         results = RemoteResults(command=command, command_id=command_id)
 
         if (emsg := ssh.connect()) != "":
@@ -242,17 +639,179 @@ class RemoteCommand:
             return results
 
         try:
-            # Perform SCP operation
-            with SCPClient(ssh.client.get_transport()) as scp:
+            sftp = ssh.open_sftp()
+            if put:
+                try:
+                    if stat.S_ISDIR(sftp.stat(destination).st_mode):
+                        destination = posixpath.join(destination, os.path.basename(source))
+                except FileNotFoundError:
+                    pass  # The destination is the new file itself
+                cls._sftp_put(sftp, source, destination)
+            else:
+                if os.path.isdir(destination):
+                    destination = os.path.join(destination, posixpath.basename(source))
+                cls._sftp_get(sftp, source, destination)
+
+            # set in cli results
+            results.exit_code = 0
+            results.determine_states(completion=True)
+
+        except paramiko.SSHException as e:
+            results.add_to_stderr(f"ERROR: SSH error while waiting for command to finish: {str(e)}")
+            results.determine_states(completion=False)
+        except socket.timeout as e:
+            results.add_to_stderr(f"ERROR: Socket timed out while waiting for command to finish. {str(e)}")
+            results.determine_states(completion=False)
+        except socket.error as e:
+            results.add_to_stderr(f"ERROR: Socket error while waiting for command to finish: {str(e)}")
+            results.determine_states(completion=False)
+
+        return results
+
+    @classmethod
+    def scp_batch(cls, pairs: List[Tuple[str, str]], ssh: RemoteConnection, put: bool = True,
+                  create_dirs: bool = False, workers: int = 1) -> RemoteResults:
+        """
+        Copies several files between the local and remote systems over SFTP.
+
+        Writes are pipelined and no per-file stat is issued, so a small file costs little more than one round trip.
+        With workers above 1 the files are spread over that many SFTP channels that transfer concurrently.
+
+        Args:
+        pairs (List[Tuple[str, str]]): The (source, destination) paths to copy.
+        ssh (RemoteConnection): The SSH connection to the remote server.
+        put (bool, optional): If True, the sources are local paths and the destinations are remote paths (uploading).
+                              If False, the sources are remote paths and the destinations are local paths (downloading).
+                              Defaults to True (uploading).
+        create_dirs (bool, optional): Whether to create missing destination directories first. Remote directories
+                                      are created by a single mkdir -p command. Defaults to False.
+        workers (int, optional): The number of SFTP channels to transfer over. Defaults to 1, which reuses the
+                                 connection's SFTP session.
+
+        Returns:
+        RemoteResults: A RemoteResults object containing the results of the transfers. The operation stops at the
+                       first failed transfer.
+        """
+        command = "; ".join(f"sftp {source} {destination}" for source, destination in pairs)
+        command_id = "sftp_put_batch" if put else "sftp_get_batch"
+        import paramiko
+        results = RemoteResults(command=command, command_id=command_id)
+
+        if (emsg := ssh.connect()) != "":
+            results.add_to_stderr(emsg)
+            results.determine_states(completion=False)
+            return results
+
+        try:
+            parents = sorted({os.path.dirname(destination) for _, destination in pairs} - {""})
+            if create_dirs and parents:
                 if put:
-                    scp.put(source, destination, recursive=False)
+                    made = cls.execute(f"mkdir -p -- {' '.join(map(shlex.quote, parents))}", "sftp_mkdir", ssh)
+                    if not made.success:
+                        results.add_to_stderr(made.stderr)
+                        results.determine_states(completion=False)
+                        return results
                 else:
-                    scp.get(source, destination, recursive=False)
+                    for parent in parents:
+                        os.makedirs(parent, exist_ok=True)
+
+            transfer = cls._sftp_put if put else cls._sftp_get
+            if workers <= 1:
+                # Every transfer shares the connection's SFTP channel
+                sftp = ssh.open_sftp()
+                for source, destination in pairs:
+                    transfer(sftp, source, destination)
+            else:
+                def run(share: List[Tuple[str, str]]) -> None:
+                    sftp = ssh.client.open_sftp()
+                    try:
+                        for source, destination in share:
+                            transfer(sftp, source, destination)
+                    finally:
+                        sftp.close()
+
+                shares = [share for share in (pairs[i::workers] for i in range(workers)) if share]
+                with ThreadPoolExecutor(max_workers=len(shares)) as executor:
+                    for future in [executor.submit(run, share) for share in shares]:
+                        future.result()
 
-                # set in cli results
-                results.exit_code = 0
-                results.determine_states(completion=True)
+            # set in cli results
+            results.exit_code = 0
+            results.determine_states(completion=True)
+
+        except paramiko.SSHException as e:
+            results.add_to_stderr(f"ERROR: SSH error while waiting for command to finish: {str(e)}")
+            results.determine_states(completion=False)
+        except socket.timeout as e:
+            results.add_to_stderr(f"ERROR: Socket timed out while waiting for command to finish. {str(e)}")
+            results.determine_states(completion=False)
+        except socket.error as e:
+            results.add_to_stderr(f"ERROR: Socket error while waiting for command to finish: {str(e)}")
+            results.determine_states(completion=False)
 
+        return results
+
+    @classmethod
+    def scp_tree(cls, source: str, destination: str, ssh: RemoteConnection, put: bool = True,
+                 timeout: float = None) -> RemoteResults:
+        """
+        Copies a directory tree between the local and remote systems as a single tar stream over one channel.
+
+        Args:
+        source (str): The directory to copy. Its contents are placed directly under destination.
+        destination (str): The directory to copy into. It is created if it does not exist.
+        ssh (RemoteConnection): The SSH connection to the remote server.
+        put (bool, optional): If True, the source is the local path and the destination is the remote path (uploading).
+                              If False, the source is the remote path and the destination is the local path (downloading).
+                              Defaults to True (uploading).
+        timeout (float, optional): Seconds to wait on the channel before giving up. Defaults to None (no limit).
+
+        Returns:
+        RemoteResults: A RemoteResults object containing the results of the transfer, including the exit code and any
+                       error messages of the remote tar.
+        """
+        if put:
+            command = f"mkdir -p -- {shlex.quote(destination)} && tar xf - -C {shlex.quote(destination)}"
+        else:
+            command = f"tar cf - -C {shlex.quote(source)} ."
+        command_id = "tar_put" if put else "tar_get"
+        import paramiko
+        results = RemoteResults(command=command, command_id=command_id)
+
+        if (emsg := ssh.connect()) != "":
+            results.add_to_stderr(emsg)
+            results.determine_states(completion=False)
+            return results
+
+        try:
+            channel = ssh.open_channel(timeout=timeout)
+            channel.settimeout(timeout)
+            channel.exec_command(command)
+            if put:
+                with channel.makefile("wb") as stream, tarfile.open(fileobj=stream, mode="w|") as tar:
+                    tar.add(source, arcname=".")
+                channel.shutdown_write()
+            else:
+                os.makedirs(destination, exist_ok=True)
+                with channel.makefile("rb") as stream, tarfile.open(fileobj=stream, mode="r|") as tar:
+                    # Refuse absolute paths, parent references and special files where tarfile supports filtering
+                    if hasattr(tarfile, "data_filter"):
+                        tar.extractall(destination, filter="data")
+                    else:
+                        tar.extractall(destination)
+
+            # Only tar's messages are kept; on a download stdout is the archive itself
+            stdout, stderr = RemoteCommand._drain(channel, timeout)
+            results.stdout = RemoteCommand._strip_lines(stdout) if put else ""
+            results.stderr = RemoteCommand._strip_lines(stderr)
+            if not channel.status_event.wait(timeout):
+                raise socket.timeout(f"No exit status received within {timeout} seconds")
+            results.exit_code = channel.recv_exit_status()
+            results.determine_states(completion=True)
+
+        except tarfile.TarError as e:
+            results.add_to_stderr(f"ERROR: Failed to transfer tar stream: {str(e)}")
+            results.determine_states(completion=False)
         except paramiko.SSHException as e:
             results.add_to_stderr(f"ERROR: SSH error while waiting for command to finish: {str(e)}")
             results.determine_states(completion=False)
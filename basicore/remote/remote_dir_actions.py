@@ -1,17 +1,48 @@
-import os
+import shlex
+import asyncio
 import logging
-from typing import Optional, Dict, List
+from typing import Iterator, Optional, Dict, List, Tuple
 from basicore.generic import Basic
-from .remote_command import RemoteCommand, RemoteConnection, RemoteExecuteException
-from .remote_file_actions import RemoteFileActions
+from .path_cache import CachedPathActions
+from .remote_command import RemoteCommand, RemoteConnection, RemoteExecuteException, RemoteResults
 
 __all__ = ['RemoteDirActions']
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-
-class RemoteDirActions(Basic):
-
+# Exit status a guarded command uses to report that its target path does not exist
+_MISSING_STATUS = 3
+
+# Command templates, formatted with paths already quoted by shlex.quote. A _GUARD prefix runs the existence check
+# and the action it guards as a single remote command.
+_GUARD = f'[ -e {{path}} ] || exit {_MISSING_STATUS}; '
+_EXISTS = 'if [ -e {path} ]; then echo 0; else echo 1; fi'
+_ISDIR = 'if [ -d {path} ]; then echo 0; elif [ -e {path} ]; then echo 1; else echo 2; fi'
+_EXISTS_MANY = 'for p in {paths}; do if [ -d "$p" ]; then echo 1; else echo 0; fi; done'
+_CREATE = 'mkdir -p -- {path}'
+_DELETE = 'rm -rf -- {path}'
+# Entries that are not links print their own size; valid links print their target's size and resolved path.
+# Fields are NUL-terminated, the one byte that cannot occur in a path, so any file name parses safely.
+_LIST = _GUARD + "find {path} -mindepth 1 -maxdepth 1 ! -type l -printf '%s\\0%p\\0' " \
+                 "-o ! -xtype l -exec stat -L --printf '%s\\000' {{}} ';' -exec readlink -fz {{}} ';'"
+_COPY = _GUARD.format(path='{source}') + 'mkdir -p -- {destination} && cp -rT -- {source} {destination}'
+# Top-level entries are handed to up to {parallelism} concurrent rm processes, each taking a batch of entries.
+_REMOVE = _GUARD + 'find {path} -mindepth 1 -maxdepth 1 {exceptions} -print0 | ' \
+                   'xargs -0r -P {parallelism} -n 256 rm -rf --'
+# Files are fed to grep in batches of 64, with one batch running per remote core. -H keeps the file name on every
+# match however the files are batched, and --line-buffered keeps lines from concurrent greps from interleaving.
+# Each batch maps grep's "no match" status 1 to success, so xargs only exits non-zero when a grep hit a real error.
+_GREP = _GUARD + "find {path} -type f {size_limit} {excluded} -print0 | " \
+                 "xargs -0r -P \"$(nproc 2>/dev/null || echo 1)\" -n 64 " \
+                 "sh -c 'grep -H --line-buffered \"$@\"; [ $? -le 1 ]' sh {flags} -e {pattern} --"
+
+
+class RemoteDirActions(CachedPathActions, Basic):
+    """
+    Directory operations on a remote server, each run as a single remote command.
+
+    Results of exists, isdir and list can be cached for cache_ttl seconds per (account, path); create, delete, copy
+    and remove drop the cached entries they affect. See CachedPathActions.
+    """
     @classmethod
     def exists(cls, directory: str, ssh: RemoteConnection) -> bool:
         """
@@ -24,7 +55,11 @@ class RemoteDirActions(Basic):
         Returns:
             bool: True if the source_dir exists, False otherwise.
         """
-        command = f'if [ -e "{directory}" ]; then echo 0; else echo 1; fi'
+        return cls._cached('exists', directory, ssh, lambda: cls._exists(directory, ssh))
+
+    @classmethod
+    def _exists(cls, directory: str, ssh: RemoteConnection) -> bool:
+        command = _EXISTS.format(path=shlex.quote(directory))
         results = RemoteCommand.execute(command=command, command_id='directory_exists', ssh=ssh)
         if not results.success:
             raise RemoteExecuteException(f"Error executing remote command: \n>'{command}'\n >{results}")
@@ -34,28 +69,79 @@ class RemoteDirActions(Basic):
         return Basic.bfail(f"Directory '{directory}' does not exist.")
 
     @classmethod
-    def exists_many(cls, directories: list[str], ssh: RemoteConnection) -> dict[str, bool]:
+    def exists_many(cls, directories: List[str], ssh: RemoteConnection) -> Dict[str, bool]:
         """
-        Determines if the file at the specified filepath exists.
+        Check which of several paths are directories on the remote server, in a single remote command.
 
-        Parameters:
-            directories (str): The paths of the files to check.
+        Args:
+            directories (List[str]): The paths to check.
             ssh (RemoteConnection): The SSH connection to the remote server.
 
         Returns:
-            bool: True if the file exists, False otherwise.
+            Dict[str, bool]: Each path mapped to True if it is an existing directory, False otherwise.
         """
-        command = f'for f in {" ".join(directories)}; do if [ -d "$f" ]; then echo "$f > 1"; ' \
-                  f'else echo "$f > 2"; fi; done'
+        if not directories:
+            return {}
+
+        # One flag per line, in argument order, so paths never need to be parsed back out of the output
+        command = _EXISTS_MANY.format(paths=' '.join(map(shlex.quote, directories)))
         results = RemoteCommand.execute(command=command, command_id='dirlist_exists', ssh=ssh)
         if not results.success:
             raise RemoteExecuteException(f"Error executing remote command: \n>'{command}'\n >{results}")
 
-        dir_exists = {}
-        for line in results.stdout.splitlines():
-            dirname, flag = line.split(" > ")
-            dir_exists[dirname] = True if flag == "1" else False
-        return dir_exists
+        return {directory: flag == "1" for directory, flag in zip(directories, results.stdout.splitlines())}
+
+    @classmethod
+    def create_many(cls, directories: List[str], ssh: RemoteConnection) -> bool:
+        """
+        Create several directories on the remote server with a single mkdir -p.
+
+        Args:
+            directories (List[str]): The paths of the directories to create.
+            ssh (RemoteConnection): The SSH connection to the remote server.
+
+        Returns:
+            bool: True if every directory exists afterwards.
+        """
+        if not directories:
+            return True
+        for directory in directories:
+            cls._invalidate(directory, ssh)
+
+        command = _CREATE.format(path=' '.join(map(shlex.quote, directories)))
+        results = RemoteCommand.execute(command=command, command_id='create_directories', ssh=ssh)
+        if not results.success:
+            raise RemoteExecuteException(f"Error executing remote command: \n>'{command}'\n >{results}")
+
+        return Basic.bpass(f"Created {len(directories)} directories.")
+
+    @classmethod
+    def delete_many(cls, directories: List[str], ssh: RemoteConnection) -> bool:
+        """
+        Remove several directories and their contents on the remote server with a single rm -rf.
+
+        Args:
+            directories (List[str]): The paths of the directories to remove.
+            ssh (RemoteConnection): The SSH connection to the remote server.
+
+        Returns:
+            bool: True if the operation is successful, False otherwise.
+        """
+        if not directories:
+            return True
+        for directory in directories:
+            cls._invalidate(directory, ssh)
+
+        command = _DELETE.format(path=' '.join(map(shlex.quote, directories)))
+        results = RemoteCommand.execute(command=command, command_id='remove_directories', ssh=ssh)
+        if not results.success:
+            logger.warning("Error executing remote command: \n>'%s'\n >%s", command, results)
+            if not results.completion:
+                raise RemoteExecuteException(f"Error executing remote command: '{command}'")
+
+        if results.success:
+            return Basic.bpass(f"Removed {len(directories)} directories.")
+        return Basic.bfail(f"Did not complete removing {len(directories)} directories.")
 
     @classmethod
     def isdir(cls, directory: str, ssh: RemoteConnection) -> bool:
@@ -68,16 +154,19 @@ class RemoteDirActions(Basic):
         Returns:
             bool: True if the directory exists, False otherwise.
         """
-        if not RemoteDirActions.exists(directory=directory, ssh=ssh):
-            return False
+        return cls._cached('isdir', directory, ssh, lambda: cls._isdir(directory, ssh))
 
-        command = f'if [ -d "{directory}" ]; then echo 0; else echo 1; fi'
+    @classmethod
+    def _isdir(cls, directory: str, ssh: RemoteConnection) -> bool:
+        command = _ISDIR.format(path=shlex.quote(directory))
         results = RemoteCommand.execute(command=command, command_id='isdir', ssh=ssh)
         if not results.success:
             raise RemoteExecuteException(f"Error executing remote command: \n>'{command}'\n >{results}")
 
         if results.stdout == "0":
             return Basic.bpass(f"'{directory}' is a directory.")
+        if results.stdout == "2":
+            return Basic.bfail(f"'{directory}' does not exist.")
         return Basic.bfail(f"'{directory}' is not a directory.")
 
     @classmethod
@@ -92,10 +181,10 @@ class RemoteDirActions(Basic):
         Returns:
             bool: True if the operation is successful, False otherwise.
         """
-        if RemoteDirActions.isdir(directory=directory, ssh=ssh):
-            return True
+        cls._invalidate(directory, ssh)
 
-        command = f'mkdir -p "{directory}"'
+        # mkdir -p succeeds on an existing directory, so no separate isdir probe is needed
+        command = _CREATE.format(path=shlex.quote(directory))
         results = RemoteCommand.execute(command=command, command_id='create_directory', ssh=ssh)
         if not results.success:
             raise RemoteExecuteException(f"Error executing remote command: \n>'{command}'\n >{results}")
@@ -114,13 +203,13 @@ class RemoteDirActions(Basic):
         Returns:
             bool: True if the operation is successful, False otherwise.
         """
-        if not RemoteDirActions.exists(directory=directory, ssh=ssh):
-            return True
+        cls._invalidate(directory, ssh)
 
-        command = f'rm -rf {directory}'
+        # rm -rf succeeds on a missing path, so no separate exists probe is needed
+        command = _DELETE.format(path=shlex.quote(directory))
         results = RemoteCommand.execute(command=command, command_id='remove_directory', ssh=ssh)
         if not results.success:
-            logger.warning(f"Error executing remote command: \n>'{command}'\n >{results}")
+            logger.warning("Error executing remote command: \n>'%s'\n >%s", command, results)
             if not results.completion:
                 raise RemoteExecuteException(f"Error executing remote command: '{command}'")
 
@@ -134,6 +223,9 @@ class RemoteDirActions(Basic):
         Get the contents of a source_dir on the remote server, excluding broken symbolic links.
         If the content is a valid symbolic link, it returns the path that the symbolic link points to.
 
+        Sizes and symlink targets are resolved on the server by a single find command, so listing a directory costs
+        one round trip however many symbolic links it holds.
+
         Args:
             directory (str): The path of the source_dir to get contents from.
             ssh (RemoteConnection): The SSH connection to the remote server.
@@ -142,39 +234,72 @@ class RemoteDirActions(Basic):
             Optional[Dict[str, int]]: A dictionary where keys are the absolute paths of the contents of the source_dir
             and values are their corresponding file sizes, if the operation is successful, None otherwise.
         """
-        if not RemoteDirActions.exists(directory=directory, ssh=ssh):
-            return None
+        return cls._cached('list', directory, ssh, lambda: cls._list(directory, ssh))
 
-        command = f'ls -l {directory}'
-        results = RemoteCommand.execute(command=command, command_id='list_directory', ssh=ssh)
+    @classmethod
+    def _list(cls, directory: str, ssh: RemoteConnection) -> Optional[Dict[str, int]]:
+        command = _LIST.format(path=shlex.quote(directory))
+        # Paths are data, so a path containing "error" must not fail the command
+        results = RemoteCommand.execute(command=command, command_id='list_directory', ssh=ssh, strip_lines=False,
+                                        scan_errors=False)
+        if results.completion and results.exit_code == _MISSING_STATUS:
+            return None
         if not results.success:
-            logger.warning(f"Error executing remote command: \n>'{command}'\n >{results}")
+            logger.warning("Error executing remote command: \n>'%s'\n >%s", command, results)
             if not results.completion:
                 raise RemoteExecuteException(f"Error executing remote command: '{command}'")
             return None
 
-        contents = results.stdout.strip().split('\n')
-        directory_contents = {}
+        # Zipping one iterator with itself pairs consecutive (size, path) fields without slicing copies of the list
+        fields = iter(results.stdout.split('\0'))
+        directory_contents = {path: int(size) for size, path in zip(fields, fields) if size.isdigit()}
 
-        for item in contents:
-            item_info = item.split()
-            if len(item_info) < 9:
-                continue
+        # Only the entry count is logged at INFO; the full listing is formatted only when DEBUG is enabled
+        logger.info("Listed %d entries in '%s'.", len(directory_contents), directory)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Contents of '%s':\n%s", directory,
+                         '\n'.join(f'{k}: {v}' for k, v in directory_contents.items()))
+        return directory_contents
 
-            # Check if it is a symbolic link
-            if item_info[0].startswith('l'):
-                symlink_target_path = item_info[-1]
-                size = RemoteFileActions.follow(symlink_target_path, ssh=ssh)
-                if size is not None:
-                    directory_contents[symlink_target_path] = size
+    @classmethod
+    def iter_list(cls, directory: str, ssh: RemoteConnection, timeout: float = None) -> Iterator[Tuple[str, int]]:
+        """
+        Get the contents of a source_dir on the remote server one entry at a time, parsing the listing as it arrives.
 
-            else:  # Regular file or source_dir
-                size = int(item_info[4])
-                full_path = os.path.join(directory, item_info[-1])
-                directory_contents[full_path] = size
+        Unlike list(), the full listing is never held in memory, so very large directories can be filtered or counted
+        in constant memory, and a caller that stops early stops the transfer. Results are not cached.
 
-        logger.info(f"Contents of '{directory}':\n" + '\n'.join(f'{k}: {v}' for k, v in directory_contents.items()))
-        return directory_contents
+        Args:
+            directory (str): The path of the source_dir to get contents from.
+            ssh (RemoteConnection): The SSH connection to the remote server.
+            timeout (float, optional): Seconds to wait for more output. Defaults to None (no limit).
+
+        Yields:
+            Tuple[str, int]: The absolute path and size of each entry, in the same form as list(). Nothing is yielded
+            if the source_dir does not exist.
+
+        Raises:
+            RemoteExecuteException: If the command could not be completed.
+        """
+        command = _LIST.format(path=shlex.quote(directory))
+        results = RemoteResults(command=command, command_id='list_directory')
+        pending = b''
+        for chunk in RemoteCommand.stream(results, ssh, timeout):
+            # Only whole (size, path) pairs are parsed; a trailing partial pair waits for the next chunk
+            fields = (pending + chunk).split(b'\0')
+            complete = (len(fields) - 1) & ~1
+            pending = b'\0'.join(fields[complete:])
+            pairs = iter(fields[:complete])
+            for size, path in zip(pairs, pairs):
+                if size.isdigit():
+                    yield path.decode(errors="replace"), int(size)
+
+        if results.completion and results.exit_code == _MISSING_STATUS:
+            return
+        if not results.success:
+            logger.warning("Error executing remote command: \n>'%s'\n >%s", command, results)
+            if not results.completion:
+                raise RemoteExecuteException(f"Error executing remote command: '{command}'")
 
     @classmethod
     def copy(cls, source_dir: str, destination_dir: str, ssh: RemoteConnection) -> bool:
@@ -190,14 +315,14 @@ class RemoteDirActions(Basic):
         Returns:
             bool: True if the operation is successful, False otherwise.
         """
-        if not RemoteDirActions.exists(directory=source_dir, ssh=ssh):
-            return False
-        RemoteDirActions.create(destination_dir, ssh=ssh)
+        cls._invalidate(destination_dir, ssh)
 
-        command = f'cp -r {source_dir}/* {destination_dir}'
+        command = _COPY.format(source=shlex.quote(source_dir), destination=shlex.quote(destination_dir))
         results = RemoteCommand.execute(command=command, command_id='copy_directory_contents', ssh=ssh)
+        if results.completion and results.exit_code == _MISSING_STATUS:
+            return Basic.bfail(f"Directory '{source_dir}' does not exist.")
         if not results.success:
-            logger.warning(f"Error executing remote command: \n>'{command}'\n >{results}")
+            logger.warning("Error executing remote command: \n>'%s'\n >%s", command, results)
             if not results.completion:
                 raise RemoteExecuteException(f"Error executing remote command: '{command}'")
 
@@ -206,27 +331,32 @@ class RemoteDirActions(Basic):
         return Basic.bfail(f"Did not complete copying contents of '{source_dir}'.")
 
     @classmethod
-    def remove(cls, directory: str, ssh: RemoteConnection, exceptions: list = None) -> bool:
+    def remove(cls, directory: str, ssh: RemoteConnection, exceptions: list = None, parallelism: int = 4) -> bool:
         """
         Remove all contents of a source_dir except for specified exceptions on the remote server.
 
         Args:
             directory (str): The path of the source_dir to remove contents from.
-            exceptions (list): optional - A list of files to keep.
+            exceptions (list): optional - A list of names of top-level entries to keep. Matched like find -name, so
+                               shell wildcards are honoured.
             ssh (RemoteConnection): The SSH connection to the remote server.
+            parallelism (int): optional - The most rm processes run at once on the remote server. Defaults to 4.
 
         Returns:
             bool: True if the operation is successful, False otherwise.
         """
-        if not RemoteDirActions.exists(directory=directory, ssh=ssh):
-            return True
+        cls._invalidate(directory, ssh)
 
-        exception_args = ' '.join(f"--exclude='{exception}'" for exception in exceptions) if exceptions else ""
-        command = f'cd {directory} && rm -rf ./* {exception_args}'
+        # Excepted names are filtered out by find itself, and xargs spreads every other entry over parallel rm calls
+        exception_args = ' '.join(f"! -name {shlex.quote(exception)}" for exception in exceptions or ())
+        command = _REMOVE.format(path=shlex.quote(directory), exceptions=exception_args,
+                                 parallelism=max(1, int(parallelism)))
 
         results = RemoteCommand.execute(command=command, command_id='remove_dir_contents', ssh=ssh)
+        if results.completion and results.exit_code == _MISSING_STATUS:
+            return True
         if not results.success:
-            logger.warning(f"Error executing remote command: \n>'{command}'\n >{results}")
+            logger.warning("Error executing remote command: \n>'%s'\n >%s", command, results)
             if not results.completion:
                 raise RemoteExecuteException(f"Error executing remote command: '{command}'")
 
@@ -237,32 +367,71 @@ class RemoteDirActions(Basic):
     @classmethod
     def grep(cls, search_text: str, directory: str, ssh: RemoteConnection, file_size_limit: str = "50M",
              exclude_file_ext: List[str] = None, ignore_case: bool = True) -> List:
-        if not RemoteDirActions.exists(directory=directory, ssh=ssh):
-            return None
-
         # filesize limit
-        file_size_limit = f"-size -{file_size_limit}" if file_size_limit else ""
+        size_limit = f"-size -{shlex.quote(file_size_limit)}" if file_size_limit else ""
 
         # excluded files
         excluded = ""
         if exclude_file_ext:
-            names = " -o ".join([f'-name "*.{ext}"' for ext in exclude_file_ext])
-            excluded = f"! \( {names} \)"
-
-        # grep command
-        i = "-i" if ignore_case else ""
-        grepcmd = f'grep {i} "{search_text}" ' + "{} +"
+            names = " -o ".join(f"-name {shlex.quote(f'*.{ext}')}" for ext in exclude_file_ext)
+            excluded = f"! '(' {names} ')'"
 
         # put it all together
-        command = f'find {directory} -type f {file_size_limit} {excluded} -exec {grepcmd}'
-        results = RemoteCommand.execute(command=command, command_id='list_directory', ssh=ssh)
+        command = _GREP.format(path=shlex.quote(directory), size_limit=size_limit, excluded=excluded,
+                               flags="-i" if ignore_case else "", pattern=shlex.quote(search_text))
+        # Matched lines carry their file paths, so "error" in a path or a line must not fail the command
+        results = RemoteCommand.execute(command=command, command_id='list_directory', ssh=ssh, scan_errors=False)
+        if results.completion and results.exit_code == _MISSING_STATUS:
+            return None
         if not results.success:
-            logger.warning(f"Error executing remote command: \n>'{command}'\n >{results}")
+            logger.warning("Error executing remote command: \n>'%s'\n >%s", command, results)
             if not results.completion:
                 raise RemoteExecuteException(f"Error executing remote command: '{command}'")
             return None
+        if not results.stdout:
+            # No batch found a match
+            return None
 
         found_lines = []
         if results.completion and results.exit_code == 0:
             found_lines = results.stdout.splitlines()
-        return found_lines
\ No newline at end of file
+        return found_lines
+
+    # Asynchronous variants. Each runs its synchronous counterpart in a worker thread, so independent calls gathered
+    # with asyncio.gather() open their channels on the shared connection concurrently instead of one after another.
+
+    @classmethod
+    async def aexists(cls, directory: str, ssh: RemoteConnection) -> bool:
+        """Asynchronous exists()."""
+        return await asyncio.to_thread(cls.exists, directory, ssh)
+
+    @classmethod
+    async def aisdir(cls, directory: str, ssh: RemoteConnection) -> bool:
+        """Asynchronous isdir()."""
+        return await asyncio.to_thread(cls.isdir, directory, ssh)
+
+    @classmethod
+    async def acreate(cls, directory: str, ssh: RemoteConnection) -> bool:
+        """Asynchronous create()."""
+        return await asyncio.to_thread(cls.create, directory, ssh)
+
+    @classmethod
+    async def adelete(cls, directory: str, ssh: RemoteConnection) -> bool:
+        """Asynchronous delete()."""
+        return await asyncio.to_thread(cls.delete, directory, ssh)
+
+    @classmethod
+    async def alist(cls, directory: str, ssh: RemoteConnection) -> Optional[Dict[str, int]]:
+        """Asynchronous list()."""
+        return await asyncio.to_thread(cls.list, directory, ssh)
+
+    @classmethod
+    async def acopy(cls, source_dir: str, destination_dir: str, ssh: RemoteConnection) -> bool:
+        """Asynchronous copy()."""
+        return await asyncio.to_thread(cls.copy, source_dir, destination_dir, ssh)
+
+    @classmethod
+    async def aremove(cls, directory: str, ssh: RemoteConnection, exceptions: list = None,
+                      parallelism: int = 4) -> bool:
+        """Asynchronous remove()."""
+        return await asyncio.to_thread(cls.remove, directory, ssh, exceptions, parallelism)
@@ -1,19 +1,68 @@
-import os
+import re
 import json
+import stat
+import shlex
+import orjson
+import socket
 import logging
-import tempfile
-from typing import Union
+from typing import Iterator, Union
 
+from .path_cache import CachedPathActions
 from .remote_command import RemoteCommand, RemoteConnection, RemoteExecuteException
 from basicore.parameters import SSHConfig
 from basicore.generic import Basic
 
 __all__ = ['RemoteFileActions']
-logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
+# Exit status a guarded command uses to report that its target path does not exist
+_MISSING_STATUS = 3
+# Exit status the read command uses to report that the file is too large to send back through cat
+_LARGE_STATUS = 4
+
+# Command templates, formatted with paths already quoted by shlex.quote. A _GUARD prefix runs the existence check
+# and the action it guards as a single remote command.
+_GUARD = f'[ -e {{path}} ] || exit {_MISSING_STATUS}; '
+_EXISTS = 'if [ -e {path} ]; then echo 0; else echo 1; fi'
+_ISFILE = 'if [ -f {path} ]; then echo 0; else echo 1; fi'
+_REMOVE = 'rm -f -- {path}'
+_READ = _GUARD + f'[ "$(stat -Lc %s -- {{path}})" -gt {{limit}} ] && exit {_LARGE_STATUS}; cat -- {{path}}'
+_FOLLOW = _GUARD + 'readlink -f -- {path}'
+# Paths are fed to one stat through xargs. stat prints each existing path with its raw mode in hex, NUL-terminated,
+# and skips missing ones, so its non-zero exit status for those is ignored. The mode, unlike the file type name, is
+# not localized.
+_EXISTS_MANY = "printf '%s\\0' {paths} | xargs -0r stat -L --printf '%n\\000%f\\000' -- 2>/dev/null; true"
+
+# A run of 19 digits may be an integer wider than 64 bits, which orjson.loads turns into a float; json keeps it exact
+_WIDE_INT = re.compile(rb'\d{19}')
+
+
+def _loads(content: bytes) -> Union[str, list, dict]:
+    """
+    Parse JSON with orjson, falling back to json for integers wider than 64 bits, NaN and Infinity.
+
+    Raises:
+    ValueError: If the content is not JSON.
+    """
+    if _WIDE_INT.search(content) is None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(content)
+
+
+class RemoteFileActions(CachedPathActions):
+    """
+    File operations on a remote server.
+
+    Results of exists and isfile can be cached for cache_ttl seconds per (account, path); remove and write drop the
+    cached entries they affect. See CachedPathActions.
 
-class RemoteFileActions:
+    Attributes:
+        READ_STREAM_THRESHOLD (int): Files larger than this many bytes are read over SFTP instead of through cat.
+    """
+    READ_STREAM_THRESHOLD = 1 << 16
 
     @classmethod
     def exists(cls, filepath: str, ssh: RemoteConnection) -> bool:
@@ -27,7 +76,11 @@ class RemoteFileActions:
         Returns:
             bool: True if the file exists, False otherwise.
         """
-        command = f'if [ -e "{filepath}" ]; then echo 0; else echo 1; fi'
+        return cls._cached('exists', filepath, ssh, lambda: cls._exists(filepath, ssh))
+
+    @classmethod
+    def _exists(cls, filepath: str, ssh: RemoteConnection) -> bool:
+        command = _EXISTS.format(path=shlex.quote(filepath))
         results = RemoteCommand.execute(command=command, command_id='file_exists', ssh=ssh)
         if not results.success:
             raise RemoteExecuteException(f"Error executing remote command: \n>'{command}'\n >{results}")
@@ -46,19 +99,21 @@ class RemoteFileActions:
             ssh (RemoteConnection): The SSH connection to the remote server.
 
         Returns:
-            bool: True if the file exists, False otherwise.
+            dict[str, bool]: Each filepath mapped to True if it is an existing file, False otherwise.
         """
-        command = f'for f in {" ".join(filepath_list)}; do if [ -f "$f" ]; then echo "$f > 1"; ' \
-                  f'else echo "$f > 2"; fi; done'
-        results = RemoteCommand.execute(command=command, command_id='filelist_exists', ssh=ssh)
+        if not filepath_list:
+            return {}
+
+        command = _EXISTS_MANY.format(paths=' '.join(map(shlex.quote, filepath_list)))
+        results = RemoteCommand.execute(command=command, command_id='filelist_exists', ssh=ssh, strip_lines=False,
+                                        scan_errors=False)
         if not results.success:
             raise RemoteExecuteException(f"Error executing remote command: \n>'{command}'\n >{results}")
 
-        file_exists = {}
-        for line in results.stdout.splitlines():
-            filename, flag = line.split(" > ")
-            file_exists[filename] = True if flag == "1" else False
-        return file_exists
+        # Paths stat did not print do not exist; the rest are files when their mode is a regular file's
+        fields = iter(results.stdout.split('\0'))
+        modes = dict(zip(fields, fields))
+        return {filepath: filepath in modes and stat.S_ISREG(int(modes[filepath], 16)) for filepath in filepath_list}
 
     @classmethod
     def isfile(cls, filepath: str, ssh: RemoteConnection) -> bool:
@@ -72,10 +127,12 @@ class RemoteFileActions:
         Returns:
             bool: True if the file exists, False otherwise.
         """
-        if not RemoteFileActions.exists(filepath=filepath, ssh=ssh):
-            return False
+        return cls._cached('isfile', filepath, ssh, lambda: cls._isfile(filepath, ssh))
 
-        command = f'if [ -f "{filepath}" ]; then echo 0; else echo 1; fi'
+    @classmethod
+    def _isfile(cls, filepath: str, ssh: RemoteConnection) -> bool:
+        # A missing path is not a file either, so no separate existence check is needed
+        command = _ISFILE.format(path=shlex.quote(filepath))
         results = RemoteCommand.execute(command=command, command_id='isfile', ssh=ssh)
         if not results.success:
             raise RemoteExecuteException(f"Error executing remote command: \n>'{command}'\n >{results}")
@@ -96,13 +153,13 @@ class RemoteFileActions:
         Returns:
             None
         """
-        if not RemoteFileActions.exists(filepath=filepath, ssh=ssh):
-            return True
+        cls._invalidate(filepath, ssh)
 
-        command = f'rm -f {filepath}'
+        # rm -f succeeds when the file is already gone, so no separate existence check is needed
+        command = _REMOVE.format(path=shlex.quote(filepath))
         results = RemoteCommand.execute(command=command, command_id='remove_file', ssh=ssh)
         if not results.success:
-            logger.warning(f"Error executing remote command: \n>'{command}'\n >{results}")
+            logger.warning("Error executing remote command: \n>'%s'\n >%s", command, results)
             if not results.completion:
                 raise RemoteExecuteException(f"Error executing remote command: '{command}'")
 
@@ -115,6 +172,9 @@ class RemoteFileActions:
         """
         Reads the content of a text file.
 
+        Files up to READ_STREAM_THRESHOLD bytes come back through cat in the same command that checks they exist;
+        larger ones are then read with read_stream.
+
         Parameters:
             filepath (str): The path of the file to read.
             ssh (RemoteConnection): The SSH connection to the remote server.
@@ -124,24 +184,55 @@ class RemoteFileActions:
         Raises:
             IOError: If an error occurs while reading the file.
         """
-        if not RemoteFileActions.exists(filepath=filepath, ssh=ssh):
-            return ""
-
-        command = f'cat {filepath}'
+        command = _READ.format(path=shlex.quote(filepath), limit=cls.READ_STREAM_THRESHOLD)
         results = RemoteCommand.execute(command=command, command_id='read_file', ssh=ssh)
+        if results.completion and results.exit_code == _MISSING_STATUS:
+            return ""
+        if results.completion and results.exit_code == _LARGE_STATUS:
+            # Large files skip the exec channel's decode and line stripping; JSON is parsed straight from the bytes
+            content = b"".join(cls.read_stream(filepath, ssh))
+            try:
+                return _loads(content)
+            except ValueError:
+                return RemoteCommand._strip_lines(content)
         if not results.success:
-            logger.warning(f"Error executing remote command: \n>'{command}'\n >{results}")
+            logger.warning("Error executing remote command: \n>'%s'\n >%s", command, results)
             if not results.completion:
                 raise RemoteExecuteException(f"Error executing remote command: '{command}'")
 
         if results.success:
             content = results.stdout
             try:
-                return json.loads(content)  # Try parsing as JSON dict or list
-            except json.JSONDecodeError:
+                return _loads(content.encode())  # Try parsing as JSON dict or list
+            except ValueError:
                 return content  # Return as plain text if parsing fails
         return Basic.sfail(f"Failed to read {filepath}.")
 
+    @classmethod
+    def read_stream(cls, filepath: str, ssh: RemoteConnection,
+                    chunk_size: int = RemoteCommand.COPY_BUFSIZE) -> Iterator[bytes]:
+        """
+        Reads the raw content of a file over the connection's SFTP session, chunk by chunk with read-ahead.
+
+        Parameters:
+            filepath (str): The path of the file to read.
+            ssh (RemoteConnection): The SSH connection to the remote server.
+            chunk_size (int): The most bytes yielded at a time. Defaults to RemoteCommand.COPY_BUFSIZE.
+
+        Yields:
+            bytes: The next chunk of the file.
+        Raises:
+            RemoteExecuteException: If the connection cannot be established.
+            IOError: If the file cannot be opened or read.
+        """
+        if (emsg := ssh.connect()) != "":
+            raise RemoteExecuteException(f"Error connecting to read '{filepath}': {emsg}")
+
+        with ssh.open_sftp().open(filepath, "rb") as remote:
+            remote.prefetch()
+            while chunk := remote.read(chunk_size):
+                yield chunk
+
     @classmethod
     def write(cls, filepath: str, data: Union[str, list, dict], ssh: RemoteConnection, mode: str = "w") -> bool:
         """
@@ -155,35 +246,34 @@ class RemoteFileActions:
             mode (str): The file mode to be used for writing. Default is "w" (write). "a" for append.
 
         Returns:
-            bool: True if the operation was successful, False otherwise.
+            bool: True if the operation was successful, False if the remote file could not be written.
         Raises:
-            RemoteExecuteException: If an error occurs while executing the remote command.
+            RemoteExecuteException: If the connection fails or is lost during the transfer.
         """
         if mode != "w":
             raise RemoteExecuteException("Only write mode is supported at this time.")
 
+        cls._invalidate(filepath, ssh)
+
+        if (emsg := ssh.connect()) != "":
+            raise RemoteExecuteException(f"Error connecting to write '{filepath}': {emsg}")
+
+        import paramiko
         try:
-            if isinstance(data, (list, dict)):
-                data = json.dumps(data)
-
-            # Write the data to a temporary file on the local system
-            with tempfile.NamedTemporaryFile(mode="w", delete=False) as tmp:
-                tmp.write(data)
-                tmp_file = tmp.name
-
-            # Use scp to copy the file to the remote system
-            command = RemoteCommand.scp(source=tmp_file, destination=filepath, ssh=ssh)
-            if command.completion:
-                if command.success:
-                    return Basic.bpass(f"Data written to remote file '{filepath}'.")
+            # The data is encoded straight into the remote file over SFTP, with no local temporary copy
+            with ssh.open_sftp().open(filepath, "wb") as remote:
+                remote.set_pipelined(True)
+                if isinstance(data, (list, dict)):
+                    for chunk in json.JSONEncoder().iterencode(data):
+                        remote.write(chunk.encode())
                 else:
-                    return Basic.bfail(f"Failed to write data to remote file '{filepath}'.")
-            else:
-                raise RemoteExecuteException(f"Error executing remote command: 'scp {tmp_file} {filepath}'")
-        finally:
-            # Ensure the temporary file is removed from the local system
-            if tmp_file:
-                os.remove(tmp_file)
+                    remote.write(data.encode())
+        except (paramiko.SSHException, EOFError, socket.timeout) as e:
+            raise RemoteExecuteException(f"Error writing remote file '{filepath}': {str(e)}")
+        except IOError as e:
+            logger.warning("Error writing remote file '%s': %s", filepath, e)
+            return Basic.bfail(f"Failed to write data to remote file '{filepath}'.")
+        return Basic.bpass(f"Data written to remote file '{filepath}'.")
 
     @classmethod
     def follow(cls, symlink_target_path: str, ssh: RemoteConnection) -> str:
@@ -197,13 +287,12 @@ class RemoteFileActions:
         Returns:
             int: The size of the path if it exists, -1 otherwise.
         """
-        if not RemoteFileActions.exists(filepath=symlink_target_path, ssh=ssh):
-            return ""
-
-        command = f'readlink -f "{symlink_target_path}"'
+        command = _FOLLOW.format(path=shlex.quote(symlink_target_path))
         results = RemoteCommand.execute(command=command, command_id='follow_symlink', ssh=ssh)
+        if results.completion and results.exit_code == _MISSING_STATUS:
+            return ""
         if not results.success:
-            logger.warning(f"Error executing remote command: \n>'{command}'\n >{results}")
+            logger.warning("Error executing remote command: \n>'%s'\n >%s", command, results)
             if not results.completion:
                 raise RemoteExecuteException(f"Error executing remote command: '{command}'")
 
@@ -0,0 +1,185 @@
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Deque, Dict, Iterator, Tuple
+from basicore.parameters.config_ssh import SSHConfig
+
+if TYPE_CHECKING:
+    import paramiko
+
+__all__ = ['SSHConnectionPool']
+logger = logging.getLogger(__name__)
+
+
+class SSHConnectionPool:
+    """
+    A process-wide pool of connected SSH clients keyed by (remote_server, ssh_port, ssh_user).
+
+    Clients are checked out with get() / acquire() and handed back with release() instead of being closed, so
+    consecutive connections to the same account skip the TCP connect, key exchange and authentication. Idle clients
+    are health-checked before reuse and closed once they have been idle longer than idle_timeout.
+
+    Attributes:
+    maxsize (int): The maximum number of idle clients kept per key. Extra released clients are closed.
+    idle_timeout (float): Seconds after which an idle client is closed instead of reused.
+    compress (bool): Whether new connections negotiate zlib compression, which cuts bandwidth for large text output
+                     at some CPU cost. Clients already connected keep their setting.
+    """
+    KEEPALIVE_INTERVAL = 30
+
+    def __init__(self, maxsize: int = 4, idle_timeout: float = 300, compress: bool = False):
+        """
+        Initialize an SSHConnectionPool instance.
+
+        Args:
+        maxsize (int, optional): The maximum number of idle clients kept per key. Defaults to 4.
+        idle_timeout (float, optional): Seconds an idle client may wait for reuse. Defaults to 300.
+        compress (bool, optional): Whether new connections negotiate compression. Defaults to False.
+        """
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.compress = compress
+        self._idle: Dict[tuple, Deque[Tuple['paramiko.SSHClient', float]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(authentication: SSHConfig) -> tuple:
+        """
+        Build the key under which clients for an authentication configuration are pooled.
+
+        Args:
+        authentication (SSHConfig): The SSH authentication configuration.
+
+        Returns:
+        tuple: The (remote_server, ssh_port, ssh_user) of the configuration, as cached on SSHConfig.pool_key.
+        """
+        return authentication.pool_key
+
+    @staticmethod
+    def is_alive(client: 'paramiko.SSHClient') -> bool:
+        """
+        Check that a client's transport is still usable by sending an SSH_MSG_IGNORE packet.
+
+        Args:
+        client (paramiko.SSHClient): The client to check.
+
+        Returns:
+        bool: True if the transport is active and accepted the packet, False otherwise.
+        """
+        import paramiko
+
+        transport = client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            transport.send_ignore()
+        except (paramiko.SSHException, EOFError, OSError) as e:
+            logger.info("Discarding dead pooled SSH connection: %s", e)
+            return False
+        return True
+
+    def _connect(self, authentication: SSHConfig) -> 'paramiko.SSHClient':
+        """
+        Open a new SSH client for an authentication configuration.
+
+        Raises:
+        paramiko.AuthenticationException: If the server rejects the credentials.
+        """
+        import paramiko
+
+        # No known_hosts file is loaded and unknown host keys are accepted, so connecting does no host-key file I/O.
+        # With a password configured, the agent and ~/.ssh key files are not probed before password authentication.
+        password = authentication.ssh_pswd
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(
+            authentication.remote_server,
+            port=authentication.ssh_port,
+            username=authentication.ssh_user,
+            password=password,
+            allow_agent=not password,
+            look_for_keys=not password,
+            compress=self.compress
+        )
+        client.get_transport().set_keepalive(SSHConnectionPool.KEEPALIVE_INTERVAL)
+        return client
+
+    def get(self, authentication: SSHConfig) -> 'paramiko.SSHClient':
+        """
+        Check out a live client for an authentication configuration, connecting a new one if none is idle.
+
+        Args:
+        authentication (SSHConfig): The SSH authentication configuration.
+
+        Returns:
+        paramiko.SSHClient: A connected client. Hand it back with release() when done.
+        """
+        key = SSHConnectionPool.key(authentication)
+        self.reap()
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                client = idle.pop()[0] if idle else None
+            if client is None:
+                return self._connect(authentication)
+            if SSHConnectionPool.is_alive(client):
+                return client
+            client.close()
+
+    def release(self, authentication: SSHConfig, client: 'paramiko.SSHClient') -> None:
+        """
+        Return a checked-out client to the pool, or close it if the pool for its key is full.
+
+        Args:
+        authentication (SSHConfig): The SSH authentication configuration the client was checked out for.
+        client (paramiko.SSHClient): The client to return.
+        """
+        with self._lock:
+            idle = self._idle.setdefault(SSHConnectionPool.key(authentication), deque())
+            if len(idle) < self.maxsize:
+                idle.append((client, time.monotonic()))
+                return
+        client.close()
+
+    @contextmanager
+    def acquire(self, authentication: SSHConfig) -> Iterator['paramiko.SSHClient']:
+        """
+        Check out a client for the duration of a with-block and return it to the pool afterwards.
+
+        Args:
+        authentication (SSHConfig): The SSH authentication configuration.
+
+        Yields:
+        paramiko.SSHClient: A connected client.
+        """
+        client = self.get(authentication)
+        try:
+            yield client
+        finally:
+            self.release(authentication, client)
+
+    def reap(self) -> None:
+        """
+        Close the idle clients that have waited longer than idle_timeout.
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = []
+        with self._lock:
+            for idle in self._idle.values():
+                # Clients are appended on release, so the oldest sit at the left end
+                while idle and idle[0][1] < cutoff:
+                    expired.append(idle.popleft()[0])
+        for client in expired:
+            client.close()
+
+    def close_all(self) -> None:
+        """
+        Close every idle client in the pool.
+        """
+        with self._lock:
+            clients = [client for idle in self._idle.values() for client, _ in idle]
+            self._idle.clear()
+        for client in clients:
+            client.close()
@@ -15,7 +15,8 @@ def remove_empty_lines(lines: List[str]) -> List[str]:
         > remove_empty_lines(lines)
         ['hello\n', 'world\n']
     """
-    return [line for line in lines if line.strip()]
+    # isspace() tests the line in place instead of allocating a stripped copy of it
+    return [line for line in lines if line and not line.isspace()]
 
 
 def strip_lines(lines: List[str], lstrip: bool = True, rstrip: bool = True) -> List[str]:
@@ -30,13 +31,15 @@ def strip_lines(lines: List[str], lstrip: bool = True, rstrip: bool = True) -> L
     Returns:
         List[str]: A list of strings with leading and/or trailing whitespace removed.
     """
-    lines = remove_empty_lines(lines)
     if lstrip and rstrip:
-        return [line.strip() for line in lines]
+        strip = str.strip
     elif lstrip:
-        return [line.lstrip() for line in lines]
+        strip = str.lstrip
     else:
-        return [line.rstrip() for line in lines]
+        strip = str.rstrip
+
+    # A line is blank exactly when stripping it leaves nothing, so one pass both strips and drops empty lines
+    return [stripped for stripped in map(strip, lines) if stripped]
 
 
 def separate_lines_in_mixed_list(lines: List[str]) -> List[str]:
@@ -80,6 +83,18 @@ def window(lines: List[str], window_size: int = 1, step: int = 1) -> List[str]:
     - windowed_lines (List[str]): A list of concatenated strings of `window_size` lines each
         with a step of `step` lines between each window.
     """
+    # Join once and record where each line starts, so every window is a single slice of the joined string
+    # instead of a fresh join of its lines. Offset i + 1 sits one past the newline ending line i.
+    joined = '\n'.join(lines)
+    starts = [0]
+    offset = 0
+    for line in lines:
+        offset += len(line) + 1
+        starts.append(offset)
+
+    def _slice(first: int, last: int) -> str:
+        return joined[starts[first]:starts[last] - 1] if last > first else ''
+
     windowed_lines = []
 
     # Define the start and end indices of each window
@@ -87,11 +102,7 @@ def window(lines: List[str], window_size: int = 1, step: int = 1) -> List[str]:
 
     # Loop through the lines and create windows
     while window_end <= len(lines):
-        # Create a window of lines
-        window_subset = lines[window_start:window_end]
-
-        # Concatenate the lines into a single string and add it to the list
-        windowed_lines.append('\n'.join(window_subset))
+        windowed_lines.append(_slice(window_start, window_end))
 
         # Update the start and end indices for the next window
         window_start += step
@@ -99,8 +110,7 @@ def window(lines: List[str], window_size: int = 1, step: int = 1) -> List[str]:
 
     # Yield the remaining lines if any
     if window_start < len(lines):
-        remaining_subset = lines[window_start:]
-        windowed_lines.append('\n'.join(remaining_subset))
+        windowed_lines.append(_slice(window_start, len(lines)))
 
     # Return the list of concatenated strings representing the windows
     return windowed_lines
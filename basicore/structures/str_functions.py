@@ -14,9 +14,9 @@ def first_word(line: str) -> str:
         > first_word("  Hello, world!")
         > 'Hello'
     """
-    if line.strip():
-        return line.lstrip().split()[0]
-    return ""
+    # Splitting at most once stops the scan after the first word instead of splitting the whole line
+    words = line.split(None, 1)
+    return words[0] if words else ""
 
 
 def first_line(lines: str) -> str:
@@ -33,7 +33,10 @@ def first_line(lines: str) -> str:
         > 'Hello'
     """
     if lines is not None:
-        return lines.splitlines()[0]
+        # Only the text before the first newline can hold the first line, so only that part is split
+        end = lines.find("\n")
+        head = lines if end == -1 else lines[:end]
+        return head.splitlines()[0] if head else ""
     return ""
 
 
@@ -47,11 +50,14 @@ def last_line(lines: str) -> str:
         str: the last line after <newline>
 
     Example:
-        > first_line("Hello\nworld!")
-        > 'Hello'
+        > last_line("Hello\nworld!")
+        > 'world!'
     """
     if lines is not None:
-        return lines.splitlines()[-1]
+        # A trailing newline ends the last line rather than starting a new one, so search for the newline before it
+        start = lines.rfind("\n", 0, len(lines) - 1) + 1
+        tail = lines[start:]
+        return tail.splitlines()[-1] if tail else ""
     return ""
 
 
@@ -105,8 +111,13 @@ def count_lspaces(text: str) -> int:
     Returns:
         int: The number of leading spaces in the text.
     """
-    tlst = [j for j,t in enumerate(text) if t != " " and t != "\t"]
-    return tlst[0] if len(tlst) > 0 else 0
+    stripped = text.lstrip(" \t")
+    # A blank line counts as having no leading spaces
+    return len(text) - len(stripped) if stripped else 0
+
+
+# Translation table that puts "\\" in front of every regular expression special character
+_REGEX_ESCAPES = str.maketrans({char: f"\\{char}" for char in ".^$*+?{}[]\\|():"})
 
 
 def escape_regex_special_chars(text: str) -> str:
@@ -119,11 +130,7 @@ def escape_regex_special_chars(text: str) -> str:
     Returns:
         str: The modified string with all regular expression special characters escaped.
     """
-    # Regular expression special characters
-    special_chars = [".", "^", "$", "*", "+", "?", "{", "}", "[", "]", "\\", "|", "(", ")", ":"]
-
-    # Add "\\" in front of any special character
-    return "".join(f"\\{char}" if char in special_chars else char for char in text)
+    return text.translate(_REGEX_ESCAPES)
 
 
 def rremove(text: str, char: str = "#") -> str:
@@ -139,10 +146,13 @@ def rremove(text: str, char: str = "#") -> str:
         str: The modified string with all characters including and after the first occurrence of the specified
             character removed.
     """
-    regex = f"{escape_regex_special_chars(char)}.*"
-    if char in text:
-        return re.sub(regex, "", text)
-    return text
+    index = text.find(char)
+    if index == -1:
+        return text
+    if "\n" not in text:
+        return text[:index]
+    # Each line is cut at its own first occurrence
+    return "\n".join(line[:cut] if (cut := line.find(char)) != -1 else line for line in text.split("\n"))
 
 
 def lremove(text: str, char: str = "#") -> str:
@@ -158,9 +168,14 @@ def lremove(text: str, char: str = "#") -> str:
         str: The modified string with all characters including and before the last occurrence of the specified
             character removed.
     """
-    regex = f".*{char}"
-    text = re.sub(regex, "", text)
-    return text
+    index = text.rfind(char)
+    if index == -1:
+        return text
+    if "\n" not in text:
+        return text[index + len(char):]
+    # Each line is cut at its own last occurrence
+    return "\n".join(line[cut + len(char):] if (cut := line.rfind(char)) != -1 else line
+                     for line in text.split("\n"))
 
 
 def replace_last(s: str, old: str, new: str) -> str:
@@ -4,7 +4,6 @@ import re
 import logging
 from typing import List, Iterator
 
-logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
 
@@ -29,7 +28,7 @@ class Grep:
             pattern = pattern.lower()
 
         if not os.path.isdir(directory):
-            logger.error(f"Provided path is not a source_dir: {directory}")
+            logger.error("Provided path is not a source_dir: %s", directory)
             return iter([])
 
         try:
@@ -40,7 +39,7 @@ class Grep:
                     if fnmatch.fnmatch(filename, pattern):
                         yield os.path.join(root, filename)
         except (OSError, FileNotFoundError) as e:
-            logger.error(f"Error searching files: {str(e)}")
+            logger.error("Error searching files: %s", e)
             return iter([])
 
     @classmethod
@@ -64,7 +63,7 @@ class Grep:
                             lines.append(f"{file_path}:{line_number}:{line}")
                             #logger.info(f"{file_path}:{line_number}:{line.strip()}")
             except (FileNotFoundError, PermissionError, OSError) as e:
-                logger.error(f"Error processing file {file_path}: {str(e)}")
+                logger.error("Error processing file %s: %s", file_path, e)
 
         return lines
 
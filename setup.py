@@ -10,6 +10,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         'paramiko>=2.7.2',  # add other dependencies as needed
+        'orjson>=3.8.0',
     ],
     classifiers=[
         'Development Status :: 3 - Alpha',
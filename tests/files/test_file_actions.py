@@ -19,6 +19,13 @@ def test_remove():
         assert not os.path.exists(filepath)
 
 
+def test_remove_missing_file():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = os.path.join(temp_dir, 'missing.txt')
+        FileActions.remove(filepath)
+        assert not os.path.exists(filepath)
+
+
 def test_read():
     data = ['line 1', 'line 2', 'line 3']
     with tempfile.NamedTemporaryFile(mode='w') as temp_file:
@@ -30,6 +37,23 @@ def test_read():
         assert result == "line 1\nline 2\nline 3"
 
 
+def test_read_json_outside_orjson():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = os.path.join(temp_dir, 'data.json')
+        with open(filepath, 'w') as f:
+            f.write('{"big": 123456789012345678901234567890}')
+        assert FileActions.read(filepath) == {"big": 123456789012345678901234567890}
+
+        with open(filepath, 'w') as f:
+            f.write('[NaN]')
+        result = FileActions.read(filepath)
+        assert result[0] != result[0]
+
+        with open(filepath, 'wb') as f:
+            f.write(b'line 1\r\nline 2\rline 3')
+        assert FileActions.read(filepath) == "line 1\nline 2\nline 3"
+
+
 def test_write():
     data = ['line 1', 'line 2', 'line 3']
     with tempfile.NamedTemporaryFile(mode='r') as temp_file:
@@ -50,6 +74,24 @@ def test_write_json():
         assert result == data
 
 
+def test_write_json_outside_orjson():
+    data = {'big': 123456789012345678901234567890}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = os.path.join(temp_dir, 'data.json')
+
+        assert FileActions.write(filepath, data)
+        assert FileActions.read(filepath) == data
+
+
+def test_write_creates_parent_dir():
+    data = {'key': 'value'}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = os.path.join(temp_dir, 'nested', 'dir', 'file.json')
+
+        assert FileActions.write(filepath, data)
+        assert FileActions.read(filepath) == data
+
+
 def test_follow_symlink():
     with tempfile.TemporaryDirectory() as temp_dir:
         target_filepath = os.path.join(temp_dir, 'target.txt')
@@ -64,6 +106,20 @@ def test_follow_symlink():
         assert result == os.path.abspath(target_filepath)
 
 
+def test_follow_symlink_relative_target():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        target_filepath = os.path.join(temp_dir, 'target.txt')
+        symlink_filepath = os.path.join(temp_dir, 'symlink.txt')
+
+        with open(target_filepath, 'w') as target_file:
+            target_file.write('Hello, world!')
+
+        os.symlink('target.txt', symlink_filepath)
+
+        result = FileActions.follow(symlink_filepath)
+        assert result == os.path.realpath(target_filepath)
+
+
 def test_follow_symlink_nonexistent_symlink():
     with tempfile.TemporaryDirectory() as temp_dir:
         symlink_filepath = os.path.join(temp_dir, 'symlink.txt')
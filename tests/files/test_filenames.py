@@ -1,6 +1,5 @@
 import os
 import tempfile
-from unittest.mock import patch
 from basicore.files import Filenames
 
 
@@ -43,10 +42,17 @@ def test_unique():
         expected_filepath = os.path.join(temp_dir, 'test_file_001.txt')
         with open(filepath, 'w') as temp_file:
             temp_file.write('Test file contents')
+        with open(os.path.join(temp_dir, 'test_file_000.txt'), 'w') as temp_file:
+            temp_file.write('Test file contents')
+
+        unique_filepath = Filenames.unique(filepath)
+        assert unique_filepath == expected_filepath
 
-        with patch('os.path.exists') as mock_exists:
-            # Return True on first call, then False on subsequent calls
-            mock_exists.side_effect = [True, False]
 
-            unique_filepath = Filenames.unique(filepath)
-            assert unique_filepath == expected_filepath
\ No newline at end of file
+def test_unique_missing_directory():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = os.path.join(temp_dir, 'missing', 'test_file.txt')
+        expected_filepath = os.path.join(temp_dir, 'missing', 'test_file_000.txt')
+
+        unique_filepath = Filenames.unique(filepath)
+        assert unique_filepath == expected_filepath
@@ -1,6 +1,8 @@
 import os
 import tempfile
+from unittest.mock import patch
 from basicore.parameters import ConfigReader
+from basicore.parameters.config_file import _parse_ini
 
 
 def test_load_config():
@@ -79,7 +81,10 @@ def test_get():
                    "boolean_key_true = true\n"
                    "boolean_key_false = false\n"
                    "json_key_dict = {\"subkey\": \"subvalue\"}\n"
-                   "json_key_list = [\"item1\", \"item2\"]\n")
+                   "json_key_list = [\"item1\", \"item2\"]\n"
+                   "negative_key = -5\n"
+                   "null_key = null\n"
+                   "not_json_key = {not json\n")
         temp_path = temp.name
 
     # test get
@@ -90,7 +95,75 @@ def test_get():
     assert config_reader.get("SECTION1", "boolean_key_false") is False
     assert config_reader.get("SECTION1", "json_key_dict") == {"subkey": "subvalue"}
     assert config_reader.get("SECTION1", "json_key_list") == ["item1", "item2"]
+    assert config_reader.get("SECTION1", "negative_key") == -5
+    assert config_reader.get("SECTION1", "null_key") is None
+    assert config_reader.get("SECTION1", "not_json_key") == "{not json"
     assert config_reader.get("SECTION1", "non_existent_key", "default") == "default"
 
     # clean up
     os.remove(temp_path)
+
+
+def test_load_config_syntax():
+    """
+    Test that load_config handles the INI syntax configparser accepts: comments, ':' delimiters, mixed-case keys,
+    continuation lines, DEFAULT keys, '%%' escapes and text after a section header.
+    """
+    # create a temporary config file
+    with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp:
+        temp.write("# comment\n[DEFAULT]\nshared = yes\n\n[SECTION1]\n; comment\nKey1: value1\n"
+                   "multi = first\n  second\npercent = 100%%\n\n[SECTION2] ; comment\nshared = no\n")
+        temp_path = temp.name
+
+    # test load_config
+    config_reader = ConfigReader(temp_path)
+    assert config_reader.config_dict == {
+        "SECTION1": {"shared": "yes", "key1": "value1", "multi": "first\nsecond", "percent": "100%"},
+        "SECTION2": {"shared": "no"},
+    }
+
+    # clean up
+    os.remove(temp_path)
+
+
+def test_load_config_cached():
+    """
+    Test that an unchanged configuration file is parsed once, and parsed again after it changes.
+    """
+    # create a temporary config file
+    with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp:
+        temp.write("[SECTION1]\nkey1 = value1\n")
+        temp_path = temp.name
+
+    # test load_config
+    with patch('basicore.parameters.config_file._parse_ini', wraps=_parse_ini) as mock_parse:
+        assert ConfigReader(temp_path)["SECTION1"]["key1"] == "value1"
+        config_reader = ConfigReader(temp_path)
+        config_reader["SECTION1"]["key1"] = "changed"
+        assert ConfigReader(temp_path)["SECTION1"]["key1"] == "value1"
+        assert mock_parse.call_count == 1
+
+        with open(temp_path, 'w') as f:
+            f.write("[SECTION1]\nkey1 = value2\n")
+        os.utime(temp_path, ns=(0, 0))
+        assert ConfigReader(temp_path)["SECTION1"]["key1"] == "value2"
+        assert mock_parse.call_count == 2
+
+    # clean up
+    os.remove(temp_path)
+
+
+def test_load_config_invalid():
+    """
+    Test that load_config logs an invalid configuration file and returns an empty dictionary.
+    """
+    # create a temporary config file with a duplicate section
+    with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp:
+        temp.write("[SECTION1]\nkey1 = value1\n[SECTION1]\nkey2 = value2\n")
+        temp_path = temp.name
+
+    # test load_config
+    assert ConfigReader(temp_path).config_dict == {}
+
+    # clean up
+    os.remove(temp_path)
@@ -81,4 +81,18 @@ def test_repr():
     config = SSHConfig(remote_server='example.com', ssh_user='user', ssh_pswd='pass', ssh_port='22',
                        remote_dir='/home/user')
     assert repr(config) == \
-           "SSHConfig(remote_server=example.com,ssh_user=user,ssh_pswd=<private>,ssh_port=22,remote_dir=/home/user)"
\ No newline at end of file
+           "SSHConfig(remote_server=example.com,ssh_user=user,ssh_pswd=<private>,ssh_port=22,remote_dir=/home/user)"
+
+
+def test_pool_key():
+    """
+    Test that the pool key leaves out the password and follows changes to the account fields.
+    """
+    config = SSHConfig(remote_server='example.com', ssh_user='user', ssh_pswd='pass', ssh_port='22')
+    assert config.pool_key == ('example.com', '22', 'user')
+    assert config.pool_key is config.pool_key
+
+    config.ssh_pswd = 'other'
+    assert config.pool_key == ('example.com', '22', 'user')
+    config.ssh_user = 'admin'
+    assert config.pool_key == ('example.com', '22', 'admin')
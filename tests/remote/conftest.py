@@ -0,0 +1,16 @@
+import pytest
+import subprocess
+from basicore.remote import RemoteResults
+
+
+@pytest.fixture
+def run_locally():
+    def execute_locally(command, command_id, ssh, strip_lines=True, scan_errors=True):
+        """Stand-in for RemoteCommand.execute that runs the command in a local shell"""
+        ran = subprocess.run(["/bin/sh", "-c", command], capture_output=True, text=True)
+        stdout = ran.stdout.strip() if strip_lines else ran.stdout
+        results = RemoteResults(command=command, command_id=command_id, stdout=stdout,
+                                stderr=ran.stderr.strip(), exit_code=ran.returncode)
+        results.determine_states(completion=True, scan_errors=scan_errors)
+        return results
+    return execute_locally
@@ -1,9 +1,15 @@
+import io
+import stat
 import pytest
+import socket
+import tarfile
+import logging
 import tempfile
+import subprocess
 import paramiko
 from unittest.mock import patch, Mock
 from basicore.parameters import SSHConfig
-from basicore.remote import RemoteCommand, RemoteConnection, RemoteResults
+from basicore.remote import RemoteCommand, RemoteConnection, RemoteResults, SSHConnectionPool
 
 @pytest.fixture
 def mock_auth():
@@ -12,6 +18,7 @@ def mock_auth():
     mock_auth.ssh_port = 22
     mock_auth.ssh_user = "user"
     mock_auth.ssh_pswd = "password"
+    mock_auth.pool_key = ("localhost", 22, "user")
     return mock_auth
 
 @pytest.fixture
@@ -20,23 +27,15 @@ def mock_ssh():
         with patch('paramiko.SSHClient') as MockSSHClient:
             mock_ssh = MockSSHClient.return_value
 
-            mock_stdin, mock_stdin_read = [Mock(), Mock()]
-            #mock_stdin_read.decode.return_value = ''
-            #mock_stdin.read.return_value = mock_stdin_read
-            mock_stdin.readlines.return_value = ''
+            mock_channel = mock_ssh.get_transport.return_value.open_session.return_value
+            out, err = [stdout.encode()], [stderr.encode()]
+            mock_channel.eof_received = True
+            mock_channel.recv_ready.side_effect = lambda: bool(out)
+            mock_channel.recv.side_effect = lambda size: out.pop(0)
+            mock_channel.recv_stderr_ready.side_effect = lambda: bool(err)
+            mock_channel.recv_stderr.side_effect = lambda size: err.pop(0)
 
-            mock_stdout, mock_stdout_read = [Mock(), Mock()]
-            #mock_stdout_read.decode.return_value = stdout
-            #mock_stdout.read.return_value = mock_stdout_read
-            mock_stdout.readlines.return_value = [stdout]
-
-            mock_stderr, mock_stderr_read = [Mock(), Mock()]
-            #mock_stderr_read.decode.return_value = stderr
-            #mock_stderr.read.return_value = mock_stderr_read
-            mock_stderr.readlines.return_value = [stderr]
-
-            mock_stdout.channel.recv_exit_status.return_value = exit_code  # Command succeeded
-            mock_ssh.exec_command.return_value = (mock_stdin, mock_stdout, mock_stderr)
+            mock_channel.recv_exit_status.return_value = exit_code  # Command succeeded
             return mock_ssh
     return create_mock_ssh
 
@@ -46,6 +45,7 @@ def mock_conn(mock_auth, mock_ssh):
     mock_conn.authentication = mock_auth
     mock_conn.client = mock_ssh
     mock_conn.connect.return_value = ""
+    mock_conn.open_channel.side_effect = lambda timeout=None: mock_conn.client.get_transport().open_session()
     return mock_conn
 
 
@@ -81,6 +81,15 @@ def test_remote_command_command_failure(mock_conn, mock_ssh, stdout, stderr, exi
     assert result.exit_code == exit_code
 
 
+@pytest.mark.parametrize('stdout, stderr, exit_code', [('line 1  \n  line 2\n', '', 0)])
+def test_remote_command_multiline_stdout(mock_conn, mock_ssh, stdout, stderr, exit_code):
+    mock_conn.client = mock_ssh(stdout, stderr, exit_code)
+    result = RemoteCommand.execute(command="ls", command_id="1", ssh=mock_conn)
+    assert result.success
+    assert result.stdout == "line 1\nline 2"
+    assert result.stderr == ""
+
+
 def test_remote_command_ssh_error(mock_auth):
     """
     Test the scenario where the SSH connection drops while waiting for the command to finish.
@@ -107,3 +116,415 @@ def test_remote_command_error_detection(mock_conn, mock_ssh, stdout, stderr, exi
     assert result.stderr == stderr
     assert result.stdout == stdout
     assert result.exit_code == exit_code
+
+
+def test_remote_connection_pool(mock_auth):
+    with patch('paramiko.SSHClient') as MockSSHClient:
+        first = RemoteConnection(mock_auth)
+        client = first.client
+        assert first.transport is client.get_transport.return_value
+        client.get_transport.return_value.set_keepalive.assert_called_once_with(
+            SSHConnectionPool.KEEPALIVE_INTERVAL)
+
+        # A released client is handed to the next connection instead of reconnecting
+        first.close()
+        assert first.client is None and first.transport is None
+        second = RemoteConnection(mock_auth)
+        assert second.client is client
+        assert MockSSHClient.call_count == 1
+        client.get_transport.return_value.send_ignore.assert_called_once()
+
+        # A held client is not shared, so a concurrent connection opens its own
+        third = RemoteConnection(mock_auth)
+        assert MockSSHClient.call_count == 2
+
+        second.close()
+        third.close()
+        RemoteConnection.close_all()
+        client.close.assert_called()
+
+
+def test_execute_many(mock_auth):
+    down = Mock(spec=SSHConfig, remote_server="down", ssh_port=22, ssh_user="user", ssh_pswd="password",
+                pool_key=("down", 22, "user"))
+
+    def connect(hostname, **kwargs):
+        if hostname == "down":
+            raise OSError("Connection refused")
+
+    def execute(command, command_id, ssh, timeout=None):
+        return RemoteResults(command=command, command_id=command_id, stdout=ssh.authentication.remote_server)
+
+    with patch('paramiko.SSHClient') as MockSSHClient, patch.object(RemoteCommand, 'execute', side_effect=execute):
+        MockSSHClient.return_value.connect.side_effect = connect
+        jobs = [("hostname", "1", mock_auth), ("hostname", "2", down), ("hostname", "3", mock_auth)]
+        results = RemoteCommand.execute_many(jobs)
+        RemoteConnection.close_all()
+
+    assert [r.command_id for r in results] == ["1", "2", "3"]
+    assert results[0].stdout == results[2].stdout == "localhost"
+    assert not results[1].completion and "Connection refused" in results[1].stderr
+    assert RemoteCommand.execute_many([]) == []
+
+
+@pytest.mark.parametrize('stdout, stderr, exit_code', [('out', '', 0)])
+def test_remote_command_uses_channel(mock_conn, mock_ssh, stdout, stderr, exit_code):
+    mock_conn.client = mock_ssh(stdout, stderr, exit_code)
+    result = RemoteCommand.execute(command="env", command_id="1", ssh=mock_conn, timeout=5, get_pty=True,
+                                   environment={"A": "1"})
+    channel = mock_conn.client.get_transport.return_value.open_session.return_value
+    channel.get_pty.assert_called_once()
+    channel.settimeout.assert_called_once_with(5)
+    channel.update_environment.assert_called_once_with({"A": "1"})
+    channel.exec_command.assert_called_once_with("env")
+    assert result.success and result.stdout == "out"
+    channel.close.assert_called_once()
+
+
+@pytest.mark.parametrize('stdout, stderr, exit_code', [('out', '', 0)])
+def test_remote_command_closes_channel_on_timeout(mock_conn, mock_ssh, stdout, stderr, exit_code):
+    mock_conn.client = mock_ssh(stdout, stderr, exit_code)
+    with patch.object(RemoteCommand, '_drain', side_effect=socket.timeout("timed out")):
+        result = RemoteCommand.execute(command="sleep 60", command_id="1", ssh=mock_conn, timeout=1)
+    channel = mock_conn.client.get_transport.return_value.open_session.return_value
+    channel.close.assert_called_once()
+    assert not result.completion and "timed out" in result.stderr
+
+
+@pytest.mark.parametrize('stdout, stderr, exit_code', [('/var/log/errors', '', 0)])
+def test_remote_command_scan_errors(mock_conn, mock_ssh, stdout, stderr, exit_code):
+    mock_conn.client = mock_ssh(stdout, stderr, exit_code)
+    assert not RemoteCommand.execute(command="ls", command_id="1", ssh=mock_conn).success
+    mock_conn.client = mock_ssh(stdout, stderr, exit_code)
+    assert RemoteCommand.execute(command="ls", command_id="1", ssh=mock_conn, scan_errors=False).success
+
+
+def test_drain_interleaves_streams():
+    channel = Mock(eof_received=False, closed=False)
+    out, err = [b"line 1\n"], [b"warn\n"]
+    channel.recv_ready.side_effect = lambda: bool(out)
+    channel.recv.side_effect = lambda size: out.pop(0)
+    channel.recv_stderr_ready.side_effect = lambda: bool(err)
+    channel.recv_stderr.side_effect = lambda size: err.pop(0)
+
+    def arrive(readable, writable, errored, timeout):
+        # The rest of the output and the EOF land while the reader is waiting
+        out.append(b"line 2\n")
+        err.append(b"more\n")
+        channel.eof_received = True
+        return readable, [], []
+
+    with patch('select.select', side_effect=arrive) as mock_select:
+        stdout, stderr = RemoteCommand._drain(channel, timeout=5)
+    mock_select.assert_called_once_with([channel], [], [], 5)
+    assert stdout == b"line 1\nline 2\n"
+    assert stderr == b"warn\nmore\n"
+
+    channel.eof_received = False
+    with patch('select.select', return_value=([], [], [])):
+        with pytest.raises(socket.timeout):
+            RemoteCommand._drain(channel, timeout=1)
+
+
+def test_stream_reads_stderr_while_stdout_is_idle(mock_conn):
+    channel = Mock(eof_received=False, closed=False)
+    mock_conn.open_channel.side_effect = None
+    mock_conn.open_channel.return_value = channel
+    out, err = [], [b"denied 1\n", b"denied 2\n"]
+    channel.recv_ready.side_effect = lambda: bool(out)
+    channel.recv.side_effect = lambda size: out.pop(0)
+    channel.recv_stderr_ready.side_effect = lambda: bool(err)
+    channel.recv_stderr.side_effect = lambda size: err.pop(0)
+    channel.recv_exit_status.return_value = 0
+
+    def arrive(readable, writable, errored, timeout):
+        # Standard output only arrives once the standard error already written has been read
+        assert not err
+        out.append(b"entry\n")
+        channel.eof_received = True
+        return readable, [], []
+
+    results = RemoteResults(command="find /", command_id="1")
+    with patch('select.select', side_effect=arrive):
+        assert list(RemoteCommand.stream(results, mock_conn, timeout=5)) == [b"entry\n"]
+    assert results.stderr == "denied 1\ndenied 2"
+    assert results.exit_code == 0
+    channel.close.assert_called_once()
+
+
+def test_ssh_connection_pool_connect_options(mock_auth):
+    pool = SSHConnectionPool(compress=True)
+    with patch('paramiko.SSHClient') as MockSSHClient:
+        pool.get(mock_auth)
+    kwargs = MockSSHClient.return_value.connect.call_args.kwargs
+    assert kwargs["compress"] is True
+    assert kwargs["allow_agent"] is False and kwargs["look_for_keys"] is False
+    MockSSHClient.return_value.load_system_host_keys.assert_not_called()
+
+
+def test_ssh_connection_pool_drops_dead_and_expired_clients(mock_auth):
+    pool = SSHConnectionPool(maxsize=1, idle_timeout=60)
+    with patch('paramiko.SSHClient') as MockSSHClient:
+        dead, fresh = Mock(), Mock()
+        dead.get_transport.return_value.is_active.return_value = False
+        MockSSHClient.return_value = fresh
+
+        pool.release(mock_auth, dead)
+        assert pool.get(mock_auth) is fresh
+        dead.close.assert_called_once()
+
+        extra = Mock()
+        pool.release(mock_auth, fresh)
+        pool.release(mock_auth, extra)
+        extra.close.assert_called_once()
+
+        with patch('time.monotonic', return_value=10 ** 9):
+            pool.reap()
+        fresh.close.assert_called_once()
+
+        with pool.acquire(mock_auth) as client:
+            assert client is fresh
+        assert pool.get(mock_auth) is fresh
+
+
+class FakeSFTPFile(io.BytesIO):
+    def __init__(self, store, path, mode):
+        super().__init__(b"" if "w" in mode else store[path])
+        self.store, self.path, self.mode = store, path, mode
+
+    def set_pipelined(self, pipelined=True):
+        self.pipelined = pipelined
+
+    def prefetch(self):
+        self.prefetched = True
+
+    def close(self):
+        if "w" in self.mode:
+            self.store[self.path] = self.getvalue()
+        super().close()
+
+
+@pytest.fixture
+def mock_sftp(mock_conn):
+    store = {}
+    mock_conn.open_sftp.return_value = mock_sftp = Mock()
+    mock_sftp.store = store
+    mock_sftp.open.side_effect = lambda path, mode, bufsize=-1: FakeSFTPFile(store, path, mode)
+    mock_sftp.dirs = {"/remote"}
+
+    def fake_stat(path):
+        if path in mock_sftp.dirs:
+            return Mock(st_mode=stat.S_IFDIR | 0o755)
+        if path in store:
+            return Mock(st_mode=stat.S_IFREG | 0o644)
+        raise FileNotFoundError(path)
+    mock_sftp.stat.side_effect = fake_stat
+    return mock_sftp
+
+
+def test_scp_sftp_roundtrip(mock_conn, mock_sftp, tmp_path):
+    payload = bytes(range(256)) * 8192  # 2 MiB, more than one copy buffer
+    (tmp_path / "local.bin").write_bytes(payload)
+
+    result = RemoteCommand.scp(str(tmp_path / "local.bin"), "/remote/file.bin", ssh=mock_conn)
+    assert result.success and result.command_id == "scp_put"
+    assert mock_sftp.store["/remote/file.bin"] == payload
+
+    (tmp_path / "empty.bin").write_bytes(b"")
+    assert RemoteCommand.scp(str(tmp_path / "empty.bin"), "/remote/empty.bin", ssh=mock_conn).success
+    assert mock_sftp.store["/remote/empty.bin"] == b""
+
+    result = RemoteCommand.scp("/remote/file.bin", str(tmp_path / "copy.bin"), ssh=mock_conn, put=False)
+    assert result.success and result.command_id == "scp_get"
+    assert (tmp_path / "copy.bin").read_bytes() == payload
+
+
+def test_scp_into_directory(mock_conn, mock_sftp, tmp_path):
+    (tmp_path / "local.txt").write_text("data")
+    assert RemoteCommand.scp(str(tmp_path / "local.txt"), "/remote", ssh=mock_conn).success
+    assert mock_sftp.store["/remote/local.txt"] == b"data"
+
+    (tmp_path / "downloads").mkdir()
+    assert RemoteCommand.scp("/remote/local.txt", str(tmp_path / "downloads"), ssh=mock_conn, put=False).success
+    assert (tmp_path / "downloads" / "local.txt").read_text() == "data"
+
+
+def test_scp_batch(mock_conn, mock_sftp, tmp_path):
+    pairs = []
+    for name in ("a", "b"):
+        (tmp_path / name).write_text(name)
+        pairs.append((str(tmp_path / name), f"/remote/{name}"))
+    result = RemoteCommand.scp_batch(pairs, ssh=mock_conn)
+    assert result.success
+    assert mock_sftp.store == {"/remote/a": b"a", "/remote/b": b"b"}
+    mock_conn.open_sftp.assert_called_once()
+
+    mock_sftp.open.side_effect = IOError("No such file")
+    result = RemoteCommand.scp_batch(pairs, ssh=mock_conn, put=False)
+    assert not result.success
+    assert "No such file" in result.stderr
+
+
+def test_scp_batch_workers_and_dirs(mock_conn, mock_sftp, tmp_path):
+    mock_conn.client = Mock()
+    mock_conn.client.open_sftp.return_value = mock_sftp
+    pairs = []
+    for index in range(5):
+        (tmp_path / f"f{index}").write_text(str(index))
+        pairs.append((str(tmp_path / f"f{index}"), f"/remote/d{index % 2}/f{index}"))
+
+    made = RemoteResults(command="mkdir", command_id="sftp_mkdir", exit_code=0)
+    made.determine_states(completion=True)
+    with patch.object(RemoteCommand, 'execute', return_value=made) as mock_execute:
+        result = RemoteCommand.scp_batch(pairs, ssh=mock_conn, create_dirs=True, workers=3)
+    mock_execute.assert_called_once_with("mkdir -p -- /remote/d0 /remote/d1", "sftp_mkdir", mock_conn)
+    assert result.success
+    assert mock_conn.client.open_sftp.call_count == 3
+    assert mock_sftp.store == {f"/remote/d{index % 2}/f{index}": str(index).encode() for index in range(5)}
+
+    pairs = [(remote, str(tmp_path / "down" / remote.rsplit("/", 1)[1])) for _, remote in pairs]
+    result = RemoteCommand.scp_batch(pairs, ssh=mock_conn, put=False, create_dirs=True, workers=2)
+    assert result.success
+    assert (tmp_path / "down" / "f4").read_text() == "4"
+
+
+class KeptBytesIO(io.BytesIO):
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def tar_channel(mock_conn):
+    channel = Mock(eof_received=True, closed=False)
+    channel.recv_ready.return_value = False
+    channel.recv_stderr_ready.return_value = False
+    channel.recv_exit_status.return_value = 0
+    mock_conn.open_channel.side_effect = None
+    mock_conn.open_channel.return_value = channel
+    return channel
+
+
+def test_scp_tree_put(mock_conn, tar_channel, tmp_path):
+    (tmp_path / "src" / "sub").mkdir(parents=True)
+    (tmp_path / "src" / "a.txt").write_text("a")
+    (tmp_path / "src" / "sub" / "b.txt").write_text("b")
+    tar_channel.makefile.return_value = stream = KeptBytesIO()
+
+    result = RemoteCommand.scp_tree(str(tmp_path / "src"), "/remote/my dir", ssh=mock_conn)
+    assert result.success and result.command_id == "tar_put"
+    tar_channel.exec_command.assert_called_once_with("mkdir -p -- '/remote/my dir' && tar xf - -C '/remote/my dir'")
+    tar_channel.shutdown_write.assert_called_once()
+    with tarfile.open(fileobj=io.BytesIO(stream.getvalue())) as tar:
+        assert {"./a.txt", "./sub/b.txt"} <= set(tar.getnames())
+
+
+def test_scp_tree_get(mock_conn, tar_channel, tmp_path):
+    (tmp_path / "remote" / "sub").mkdir(parents=True)
+    (tmp_path / "remote" / "sub" / "b.txt").write_text("b")
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode="w") as tar:
+        tar.add(str(tmp_path / "remote"), arcname=".")
+    tar_channel.makefile.return_value = io.BytesIO(archive.getvalue())
+
+    result = RemoteCommand.scp_tree("/remote", str(tmp_path / "local"), ssh=mock_conn, put=False)
+    assert result.success and result.command_id == "tar_get"
+    tar_channel.exec_command.assert_called_once_with("tar cf - -C /remote .")
+    assert (tmp_path / "local" / "sub" / "b.txt").read_text() == "b"
+
+    tar_channel.makefile.return_value = io.BytesIO(b"")
+    result = RemoteCommand.scp_tree("/missing", str(tmp_path / "local"), ssh=mock_conn, put=False)
+    assert not result.success and "tar stream" in result.stderr
+
+
+def test_determine_states_error_case_insensitive():
+    result = RemoteResults(command="ls", command_id="1", stdout="all good", stderr="", exit_code=0)
+    result.determine_states(completion=True)
+    assert not result.errors
+    assert result.success
+
+    result.stderr = "fatal: Error while reading"
+    result.determine_states(completion=True)
+    assert result.errors
+    assert not result.success
+
+
+def test_determine_states_error_across_scan_chunks():
+    for offset in (0, 2, 4, 5):
+        stdout = "x" * ((1 << 16) - offset) + "ErRoR" + "y" * 100
+        result = RemoteResults(command="ls", command_id="1", stdout=stdout, exit_code=0)
+        result.determine_states(completion=True)
+        assert result.errors
+
+    result = RemoteResults(command="ls", command_id="1", stdout="err or\n" * 50000, exit_code=0)
+    result.determine_states(completion=True)
+    assert not result.errors and result.success
+
+
+def test_remote_results_repr_truncates_output():
+    result = RemoteResults(command="cat big", command_id="1", stdout="x" * 10000)
+    text = repr(result)
+    assert text.startswith("RemoteResults(")
+    assert "<10000 chars>" in text
+    assert len(text) < 1000
+
+
+def test_determine_states_logs_lazily():
+    result = RemoteResults(command="make", command_id="1", stdout="ERROR: build failed", exit_code=2)
+    logger = logging.getLogger("basicore.remote.remote_command")
+    with patch.object(RemoteResults, '__repr__', return_value="RemoteResults()") as mock_repr:
+        with patch.object(logger, 'isEnabledFor', return_value=False):
+            result.determine_states(completion=True)
+        mock_repr.assert_not_called()
+    assert not result.success
+
+
+def test_remote_results_slots():
+    result = RemoteResults(command="ls", command_id="1")
+    assert result.stdout == "" and result.exit_code == -1 and not result.success
+    with pytest.raises(AttributeError):
+        result.unknown = True
+
+
+@pytest.mark.parametrize('stdout, stderr, exit_code', [('stdout', '', 0)])
+def test_remote_command_exit_status_timeout(mock_conn, mock_ssh, stdout, stderr, exit_code):
+    mock_conn.client = mock_ssh(stdout, stderr, exit_code)
+    channel = mock_conn.client.get_transport.return_value.open_session.return_value
+    channel.status_event.wait.return_value = False
+    result = RemoteCommand.execute(command="sleep 60", command_id="1", ssh=mock_conn, timeout=1)
+    channel.status_event.wait.assert_called_once_with(1)
+    assert not result.completion
+    assert not result.success
+    assert "timed out" in result.stderr
+
+
+def test_execute_batch(mock_conn):
+    """Run the generated batch script through a local shell and parse it back via a mocked channel"""
+    commands = ["echo one", "echo two; echo oops >&2; false", "printf 'no newline'", "cd / && pwd"]
+    channel = Mock(eof_received=False, closed=False)
+    mock_conn.open_shell.return_value = channel
+
+    def run_script(script):
+        ran = subprocess.run(["/bin/sh"], input=script, capture_output=True)
+        channel.recv_ready.side_effect = [True, False]
+        channel.recv.return_value = ran.stdout
+        channel.recv_stderr_ready.side_effect = [True, False]
+        channel.recv_stderr.return_value = ran.stderr
+    channel.sendall.side_effect = run_script
+
+    with patch('select.select', return_value=([channel], [], [])):
+        batch = RemoteCommand.execute_batch(commands, command_id="batch", ssh=mock_conn)
+
+    assert [r.command_id for r in batch] == ["batch_0", "batch_1", "batch_2", "batch_3"]
+    assert [r.stdout for r in batch] == ["one", "two", "no newline", "/"]
+    assert [r.stderr for r in batch] == ["", "oops", "", ""]
+    assert [r.exit_code for r in batch] == [0, 1, 0, 0]
+    assert [r.success for r in batch] == [True, False, True, True]
+
+
+def test_execute_batch_timeout(mock_conn):
+    mock_conn.open_shell.return_value = Mock()
+    with patch('select.select', return_value=([], [], [])):
+        batch = RemoteCommand.execute_batch(["sleep 60"], command_id="batch", ssh=mock_conn, timeout=1)
+    assert not batch[0].completion
+    assert "timed out" in batch[0].stderr
+    mock_conn.close_shell.assert_called_once()
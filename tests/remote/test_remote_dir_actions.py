@@ -1,8 +1,13 @@
 import os
+import shlex
+import asyncio
+import logging
+import threading
 import pytest
 import tempfile
-from unittest.mock import patch, PropertyMock
-from basicore.remote import RemoteDirActions, RemoteExecuteException
+import subprocess
+from unittest.mock import patch, Mock, PropertyMock
+from basicore.remote import RemoteDirActions, RemoteExecuteException, RemotePathCache
 from basicore.parameters import SSHConfig
 
 def test_exists():
@@ -28,6 +33,10 @@ def test_create():
             mock_execute.return_value = PropertyMock(success=True, completion=True, errors=False)
             result = RemoteDirActions.create(temp_dir, SSHConfig())
             assert result == True
+            # mkdir -p is idempotent, so create is a single command with no isdir/exists probe
+            mock_isdir.assert_not_called()
+            mock_execute.assert_called_once()
+            assert mock_execute.call_args.kwargs['command'] == f'mkdir -p -- {shlex.quote(temp_dir)}'
 
             mock_execute.return_value = PropertyMock(success=False, completion=True, errors=False)
             with pytest.raises(RemoteExecuteException):
@@ -57,10 +66,12 @@ def test_list():
     """Test RemoteDirActions.list method"""
     temp_dir = tempfile.mkdtemp()
     with patch('basicore.remote.RemoteCommand.execute') as mock_execute:
-        with patch('basicore.remote.RemoteDirActions.exists', return_value=True):
-            with patch('basicore.remote.RemoteFileActions.follow', return_value=1024):
-                mock_execute.return_value = PropertyMock(success=True, completion=True, stdout='lrwxrwxrwx 1 user group 9 May 12 10:30 link -> target')
-                assert RemoteDirActions.list(temp_dir, SSHConfig()) == {'target': 1024}
+        with patch('basicore.remote.RemoteFileActions.follow') as mock_follow:
+            mock_execute.return_value = PropertyMock(success=True, completion=True,
+                                                     stdout=f'6\0{temp_dir}/file\0001024\0/data/target\0')
+            assert RemoteDirActions.list(temp_dir, SSHConfig()) == {f'{temp_dir}/file': 6, '/data/target': 1024}
+            mock_follow.assert_not_called()
+            assert mock_execute.call_count == 1
 
         mock_execute.return_value = PropertyMock(success=False, completion=True, errors=False)
         with patch('basicore.remote.RemoteDirActions.exists', return_value=True):
@@ -73,6 +84,88 @@ def test_list():
     os.rmdir(temp_dir)
 
 
+class LocalChannel:
+    """Stand-in for a paramiko Channel that runs the command in a local shell and returns its output in small pieces"""
+    def __init__(self, piece=5):
+        self.piece = piece
+        self.status_event = threading.Event()
+        self.eof_received = False
+        self.closed = False
+
+    def settimeout(self, timeout):
+        pass
+
+    def exec_command(self, command):
+        ran = subprocess.run(["/bin/sh", "-c", command], capture_output=True)
+        self.stdout, self.stderr, self.exit_code = ran.stdout, ran.stderr, ran.returncode
+        self.eof_received = True
+        self.status_event.set()
+
+    def recv_ready(self):
+        return bool(self.stdout)
+
+    def recv(self, size):
+        chunk, self.stdout = self.stdout[:min(size, self.piece)], self.stdout[min(size, self.piece):]
+        return chunk
+
+    def recv_stderr_ready(self):
+        return bool(self.stderr)
+
+    def recv_stderr(self, size):
+        chunk, self.stderr = self.stderr[:size], self.stderr[size:]
+        return chunk
+
+    def recv_exit_status(self):
+        return self.exit_code
+
+    def close(self):
+        self.closed = True
+
+
+def test_list_resolves_symlinks_in_one_command(tmp_path, run_locally):
+    """Test RemoteDirActions.list against a real directory holding valid and broken symbolic links"""
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "file").write_text("hello")
+    (tmp_path / "link").symlink_to(tmp_path / "file")
+    (tmp_path / "broken").symlink_to(tmp_path / "nowhere")
+    (tmp_path / " odd\nname ").write_text("x")
+    with patch('basicore.remote.RemoteCommand.execute', side_effect=run_locally) as mock_execute:
+        contents = RemoteDirActions.list(str(tmp_path), SSHConfig())
+        assert mock_execute.call_count == 1
+        assert RemoteDirActions.list(str(tmp_path / "missing"), SSHConfig()) is None
+    assert contents[str(tmp_path / "file")] == 5
+    assert str(tmp_path / "sub") in contents
+    assert contents[str(tmp_path / " odd\nname ")] == 1
+    assert str(tmp_path / "broken") not in contents and str(tmp_path / "nowhere") not in contents
+
+
+def test_list_path_containing_error(tmp_path, run_locally):
+    """Test RemoteDirActions.list does not mistake "error" in a path for a failed command"""
+    directory = tmp_path / "var" / "log" / "errors"
+    directory.mkdir(parents=True)
+    (directory / "error.log").write_text("x")
+    with patch('basicore.remote.RemoteCommand.execute', side_effect=run_locally):
+        assert RemoteDirActions.list(str(directory), SSHConfig()) == {str(directory / "error.log"): 1}
+
+
+def test_iter_list_streams_entries(tmp_path, run_locally):
+    """Test RemoteDirActions.iter_list parses entries split across output chunks and matches list()"""
+    for index in range(20):
+        (tmp_path / f"file {index}").write_text("x" * index)
+    (tmp_path / "link").symlink_to(tmp_path / "file 3")
+    channel = LocalChannel()
+    ssh = Mock(authentication=SSHConfig())
+    ssh.connect.return_value = ""
+    ssh.open_channel.return_value = channel
+    with patch('basicore.remote.RemoteCommand.execute', side_effect=run_locally):
+        expected = RemoteDirActions.list(str(tmp_path), ssh)
+    assert dict(RemoteDirActions.iter_list(str(tmp_path), ssh)) == expected
+    assert channel.closed
+
+    ssh.open_channel.return_value = LocalChannel()
+    assert list(RemoteDirActions.iter_list(str(tmp_path / "missing"), ssh)) == []
+
+
 def test_copy():
     """Test RemoteDirActions.copy method"""
     source_dir = tempfile.mkdtemp()
@@ -106,3 +199,183 @@ def test_remove():
             with pytest.raises(RemoteExecuteException):
                 RemoteDirActions.remove(temp_dir, SSHConfig())
     os.rmdir(temp_dir)
+
+
+def test_isdir():
+    """Test RemoteDirActions.isdir method"""
+    with patch('basicore.remote.RemoteCommand.execute') as mock_execute:
+        mock_execute.return_value = PropertyMock(success=True, completion=True, errors=False, stdout="0")
+        assert RemoteDirActions.isdir("/tmp", SSHConfig()) is True
+        mock_execute.return_value = PropertyMock(success=True, completion=True, errors=False, stdout="1")
+        assert RemoteDirActions.isdir("/etc/hosts", SSHConfig()) is False
+        mock_execute.return_value = PropertyMock(success=True, completion=True, errors=False, stdout="2")
+        assert RemoteDirActions.isdir("/missing", SSHConfig()) is False
+        assert mock_execute.call_count == 3
+
+
+def test_missing_directory_single_command():
+    """Test that the existence guard runs in the same remote command as the action"""
+    with patch('basicore.remote.RemoteCommand.execute') as mock_execute:
+        mock_execute.return_value = PropertyMock(success=False, completion=True, exit_code=3)
+        assert RemoteDirActions.list("/missing", SSHConfig()) is None
+        assert RemoteDirActions.copy("/missing", "/dest", SSHConfig()) is False
+        assert RemoteDirActions.remove("/missing", SSHConfig()) is True
+        assert RemoteDirActions.grep("text", "/missing", SSHConfig()) is None
+        assert mock_execute.call_count == 4
+        assert mock_execute.call_args.kwargs['command'].startswith('[ -e /missing ] || exit 3; ')
+
+
+def test_cache(monkeypatch):
+    """Test that exists/isdir/list results are cached per account and dropped by changes"""
+    monkeypatch.setattr(RemoteDirActions, 'cache_ttl', 5.0)
+    RemoteDirActions.clear_cache()
+    ssh = Mock(authentication=SSHConfig(remote_server='host', ssh_user='user', ssh_port='22'))
+    other = Mock(authentication=SSHConfig(remote_server='other', ssh_user='user', ssh_port='22'))
+    with patch('basicore.remote.RemoteCommand.execute') as mock_execute:
+        mock_execute.return_value = PropertyMock(success=True, completion=True, errors=False, stdout="0")
+        assert RemoteDirActions.exists("/data/dir", ssh) is True
+        assert RemoteDirActions.exists("/data/dir", ssh) is True
+        assert mock_execute.call_count == 1
+        assert RemoteDirActions.exists("/data/dir", other) is True
+        assert mock_execute.call_count == 2
+
+        # Deleting the directory drops it, its children and its parent from the cache
+        RemoteDirActions.delete("/data/dir", ssh)
+        mock_execute.return_value = PropertyMock(success=True, completion=True, errors=False, stdout="1")
+        assert RemoteDirActions.exists("/data/dir", ssh) is False
+        assert RemoteDirActions.exists("/data/dir", other) is True
+        assert mock_execute.call_count == 4
+
+        monkeypatch.setattr(RemoteDirActions, 'cache_ttl', 0.0)
+        assert RemoteDirActions.exists("/data/dir", other) is False
+    RemoteDirActions.clear_cache()
+
+
+def test_path_cache_invalidate():
+    """Test RemotePathCache.invalidate and maxsize eviction"""
+    cache = RemotePathCache(maxsize=4)
+    for path in ("/a", "/a/b", "/a/b/c", "/a/bc"):
+        cache.put(("acct", "exists", path), True)
+    cache.invalidate("acct", "/a/b")
+    assert cache.get(("acct", "exists", "/a"), 5) == (False, None)
+    assert cache.get(("acct", "exists", "/a/b/c"), 5) == (False, None)
+    assert cache.get(("acct", "exists", "/a/bc"), 5) == (True, True)
+    for path in ("/x", "/y", "/z", "/w"):
+        cache.put(("acct", "exists", path), True)
+    assert cache.get(("acct", "exists", "/a/bc"), 5) == (False, None)
+    assert cache.get(("acct", "exists", "/w"), 0) == (False, None)
+
+
+def test_async_variants_run_concurrently():
+    """Test that gathered async calls overlap instead of running one after another"""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def execute(command, command_id, ssh, **kwargs):
+        # Every call must be in flight at once for the barrier to release
+        barrier.wait()
+        return PropertyMock(success=True, completion=True, errors=False, stdout="0", exit_code=0)
+
+    async def workflow():
+        return await asyncio.gather(RemoteDirActions.aexists("/a", SSHConfig()),
+                                    RemoteDirActions.aisdir("/b", SSHConfig()),
+                                    RemoteDirActions.acreate("/c", SSHConfig()))
+
+    with patch('basicore.remote.RemoteCommand.execute', side_effect=execute):
+        assert asyncio.run(workflow()) == [True, True, True]
+
+
+def test_list_logs_count_at_info(caplog):
+    """Test that list() logs only the entry count unless DEBUG is enabled"""
+    stdout = ''.join(f'{i}\0/data/file{i}\0' for i in range(100))
+    with patch('basicore.remote.RemoteCommand.execute') as mock_execute:
+        mock_execute.return_value = PropertyMock(success=True, completion=True, stdout=stdout)
+        with caplog.at_level(logging.INFO, logger='basicore.remote.remote_dir_actions'):
+            contents = RemoteDirActions.list('/data', SSHConfig())
+    assert len(contents) == 100 and contents['/data/file99'] == 99
+    assert "Listed 100 entries in '/data'." in caplog.text
+    assert '/data/file99' not in caplog.text
+
+
+def test_commands_quote_paths(tmp_path, run_locally):
+    """Test that paths and patterns with shell metacharacters reach the remote commands intact"""
+    directory = tmp_path / "it's a $dir"
+    with patch('basicore.remote.RemoteCommand.execute', side_effect=run_locally):
+        assert RemoteDirActions.create(str(directory / "sub"), SSHConfig()) is True
+        (directory / "sub" / "notes.txt").write_text("-v; find me\n")
+        (directory / "sub" / "skip.log").write_text("-v; find me\n")
+        assert RemoteDirActions.isdir(str(directory), SSHConfig()) is True
+        # Only notes.txt is searched
+        assert RemoteDirActions.grep("-v; find", str(directory), SSHConfig(), exclude_file_ext=["log"]) == \
+               [f"{directory / 'sub' / 'notes.txt'}:-v; find me"]
+        assert RemoteDirActions.delete(str(directory), SSHConfig()) is True
+    assert not directory.exists()
+
+
+def test_grep_across_batches(tmp_path, run_locally):
+    """Test RemoteDirActions.grep keeps the matches of one batch when the other batches find nothing"""
+    directory = tmp_path / "errors"
+    directory.mkdir()
+    for index in range(200):
+        (directory / f"f{index}.txt").write_text("needle\n" if index == 1 else "hay\n")
+    with patch('basicore.remote.RemoteCommand.execute', side_effect=run_locally):
+        assert RemoteDirActions.grep("needle", str(directory), SSHConfig()) == [f"{directory / 'f1.txt'}:needle"]
+        assert RemoteDirActions.grep("missing", str(directory), SSHConfig()) is None
+        # An invalid pattern is a grep error (status 2), not a missing match
+        assert RemoteDirActions.grep("[", str(directory), SSHConfig(), ignore_case=False) is None
+
+
+def test_grep_reports_batch_errors():
+    """Test RemoteDirActions.grep fails when a batch's grep hit an error, even if other batches matched"""
+    with patch('basicore.remote.RemoteCommand.execute') as mock_execute:
+        mock_execute.return_value = PropertyMock(success=False, completion=True, exit_code=123,
+                                                 stdout="/data/f1.txt:needle")
+        assert RemoteDirActions.grep("needle", "/data", SSHConfig()) is None
+        assert mock_execute.call_args.kwargs['scan_errors'] is False
+
+
+def test_copy_includes_hidden_entries(tmp_path, run_locally):
+    """Test RemoteDirActions.copy copies the whole tree, hidden entries included, into a new destination"""
+    source = tmp_path / "src dir"
+    (source / ".config").mkdir(parents=True)
+    (source / ".config" / "settings").write_text("a")
+    (source / "$file").write_text("b")
+    destination = tmp_path / "dest's"
+    with patch('basicore.remote.RemoteCommand.execute', side_effect=run_locally):
+        assert RemoteDirActions.copy(str(source), str(destination), SSHConfig()) is True
+    assert (destination / ".config" / "settings").read_text() == "a"
+    assert (destination / "$file").read_text() == "b"
+
+
+def test_many_variants(tmp_path, run_locally):
+    """Test exists_many/create_many/delete_many each issue one command for all paths"""
+    paths = [str(tmp_path / "a"), str(tmp_path / "b c"), str(tmp_path / "d")]
+    with patch('basicore.remote.RemoteCommand.execute', side_effect=run_locally) as mock_execute:
+        assert RemoteDirActions.create_many(paths[:2], SSHConfig()) is True
+        assert RemoteDirActions.exists_many(paths, SSHConfig()) == dict(zip(paths, [True, True, False]))
+        assert RemoteDirActions.delete_many(paths, SSHConfig()) is True
+        assert RemoteDirActions.exists_many(paths, SSHConfig()) == dict(zip(paths, [False, False, False]))
+        assert mock_execute.call_count == 4
+        assert RemoteDirActions.exists_many([], SSHConfig()) == {}
+        assert mock_execute.call_count == 4
+
+
+def test_remove_keeps_exceptions(tmp_path, run_locally):
+    """Test RemoteDirActions.remove deletes everything but the excepted names, hidden entries included"""
+    for name in ("keep.txt", "drop.txt", ".hidden", "with space"):
+        (tmp_path / name).write_text(name)
+    (tmp_path / "subdir" / "nested").mkdir(parents=True)
+    with patch('basicore.remote.RemoteCommand.execute', side_effect=run_locally) as mock_execute:
+        assert RemoteDirActions.remove(str(tmp_path), SSHConfig(), exceptions=["keep.txt", "with space"]) is True
+        assert mock_execute.call_count == 1
+    assert sorted(os.listdir(tmp_path)) == ["keep.txt", "with space"]
+
+
+def test_remove_in_parallel(tmp_path, run_locally):
+    """Test RemoteDirActions.remove spreads many entries over parallel rm batches"""
+    for index in range(600):
+        (tmp_path / f"file {index}").write_text("x")
+    (tmp_path / "keep").mkdir()
+    with patch('basicore.remote.RemoteCommand.execute', side_effect=run_locally) as mock_execute:
+        assert RemoteDirActions.remove(str(tmp_path), SSHConfig(), exceptions=["keep"], parallelism=3) is True
+        assert "-P 3 " in mock_execute.call_args.kwargs['command']
+    assert os.listdir(tmp_path) == ["keep"]
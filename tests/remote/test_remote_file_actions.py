@@ -1,9 +1,12 @@
+import io
 import os
+import json
+import shlex
 import pytest
 import tempfile
-from unittest.mock import patch, Mock, PropertyMock, MagicMock
+from unittest.mock import patch, Mock, PropertyMock
 from basicore.parameters import SSHConfig
-from basicore.remote import RemoteCommand, RemoteExecuteException, RemoteFileActions
+from basicore.remote import RemoteCommand, RemoteDirActions, RemoteExecuteException, RemoteFileActions
 
 
 def test_exists():
@@ -52,23 +55,38 @@ def test_read():
                 mock_execute.return_value = PropertyMock(success=True, completion=True, errors=False,
                                                          stdout='{"key": "value"}')
                 assert RemoteFileActions.read(temp_file.name, SSHConfig()) == {"key": "value"}
+                mock_execute.return_value.stdout = '[123456789012345678901234567890, NaN]'
+                big, nan = RemoteFileActions.read(temp_file.name, SSHConfig())
+                assert big == 123456789012345678901234567890 and nan != nan
                 mock_execute.return_value = PropertyMock(success=False, completion=False)
                 with pytest.raises(RemoteExecuteException):
                     RemoteFileActions.read(temp_file.name, SSHConfig())
 
 
-def test_write():
+class LocalSFTPFile(io.FileIO):
+    """Local file standing in for a paramiko SFTPFile"""
+    def prefetch(self):
+        pass
+
+    def set_pipelined(self, pipelined=True):
+        pass
+
+
+def test_write(tmp_path):
     """Test RemoteFileActions.write method"""
-    file_content = "This is a test content"
-    with patch('basicore.remote.RemoteCommand.scp') as mock_scp:
-        mock_scp.return_value = PropertyMock(completion=True, success=True)
-        with patch('tempfile.NamedTemporaryFile') as mock_tmp, patch('os.remove') as mock_remove:
-            mock_file = MagicMock()
-            mock_file.name = '/tmp/tmpfile'
-            mock_tmp.return_value.__enter__.return_value = mock_file
-            assert RemoteFileActions.write(mock_file.name, file_content, SSHConfig()) is True
-            mock_file.write.assert_called_once_with(file_content)
-            mock_remove.assert_called_once_with(mock_file.name)
+    ssh = Mock()
+    ssh.connect.return_value = ""
+    ssh.open_sftp.return_value.open.side_effect = LocalSFTPFile
+    target = tmp_path / "out.json"
+    with patch.object(RemoteFileActions, '_invalidate'):
+        assert RemoteFileActions.write(str(target), {"key": ["value", 1]}, ssh) is True
+        assert json.loads(target.read_text()) == {"key": ["value", 1]}
+        assert RemoteFileActions.write(str(target), "This is a test content", ssh) is True
+        assert target.read_text() == "This is a test content"
+        assert RemoteFileActions.write(str(tmp_path / "missing" / "out"), "text", ssh) is False
+        ssh.connect.return_value = "ERROR: unreachable"
+        with pytest.raises(RemoteExecuteException):
+            RemoteFileActions.write(str(target), "text", ssh)
 
 
 def test_follow():
@@ -81,3 +99,88 @@ def test_follow():
                 mock_execute.return_value = PropertyMock(success=True, completion=True, errors=False, stdout=name1)
                 assert RemoteFileActions.follow(name2, SSHConfig()) == name1
             os.remove(name2)
+
+
+def test_commands_quote_paths():
+    """Test that file paths are quoted in the remote commands"""
+    filepath = "/tmp/it's $HOME; rm -rf ~"
+    with patch('basicore.remote.RemoteFileActions.exists', return_value=True):
+        with patch('basicore.remote.RemoteCommand.execute') as mock_execute:
+            mock_execute.return_value = PropertyMock(success=True, completion=True, errors=False, stdout="text")
+            RemoteFileActions.read(filepath, SSHConfig())
+            quoted = shlex.quote(filepath)
+            assert mock_execute.call_args.kwargs['command'].startswith(f"[ -e {quoted} ] || exit 3; ")
+            assert mock_execute.call_args.kwargs['command'].endswith(f"cat -- {quoted}")
+            RemoteFileActions.remove(filepath, SSHConfig())
+            assert mock_execute.call_args.kwargs['command'] == f"rm -f -- {quoted}"
+
+
+def test_missing_file_single_command():
+    """Test that the existence guard runs in the same remote command as the action"""
+    with patch('basicore.remote.RemoteCommand.execute') as mock_execute:
+        mock_execute.return_value = PropertyMock(success=False, completion=True, exit_code=3)
+        assert RemoteFileActions.read("/missing", SSHConfig()) == ""
+        assert RemoteFileActions.follow("/missing", SSHConfig()) == ""
+        mock_execute.return_value = PropertyMock(success=True, completion=True, errors=False, stdout="1")
+        assert RemoteFileActions.isfile("/missing", SSHConfig()) is False
+        assert mock_execute.call_count == 3
+
+
+def test_exists_many(tmp_path, run_locally):
+    """Test RemoteFileActions.exists_many checks every path with one command"""
+    (tmp_path / "a > 1").write_text("a")
+    (tmp_path / "error").write_text("e")
+    (tmp_path / "empty").write_text("")
+    (tmp_path / "dir").mkdir()
+    (tmp_path / "link").symlink_to(tmp_path / "empty")
+    paths = [str(tmp_path / name) for name in ("a > 1", "error", "empty", "dir", "link", "missing")]
+    with patch('basicore.remote.RemoteCommand.execute', side_effect=run_locally) as mock_execute:
+        assert RemoteFileActions.exists_many(paths, SSHConfig()) == \
+               dict(zip(paths, [True, True, True, False, True, False]))
+        assert mock_execute.call_count == 1
+        assert RemoteFileActions.exists_many([], SSHConfig()) == {}
+        assert mock_execute.call_count == 1
+
+
+def test_read_large_file_over_sftp(tmp_path, run_locally):
+    """Test RemoteFileActions.read switches to SFTP for files above READ_STREAM_THRESHOLD"""
+    path = tmp_path / "big.json"
+    path.write_text('{"key": "' + "v" * RemoteFileActions.READ_STREAM_THRESHOLD + '"}')
+    ssh = Mock()
+    ssh.connect.return_value = ""
+    ssh.open_sftp.return_value.open.side_effect = LocalSFTPFile
+    with patch.object(RemoteFileActions, 'READ_STREAM_THRESHOLD', 1024):
+        with patch('basicore.remote.RemoteCommand.execute', side_effect=run_locally):
+            assert RemoteFileActions.read(str(path), ssh) == {"key": "v" * 65536}
+            path.write_text("  small text  \n")
+            assert RemoteFileActions.read(str(path), ssh) == "small text"
+            assert ssh.open_sftp.return_value.open.call_count == 1
+            path.write_text('{"big": 123456789012345678901234567890, "pad": "' + "v" * 2048 + '"}')
+            assert RemoteFileActions.read(str(path), ssh)["big"] == 123456789012345678901234567890
+    path.write_text("  small text  \n")
+    assert b"".join(RemoteFileActions.read_stream(str(path), ssh, chunk_size=4)) == b"  small text  \n"
+
+
+def test_cache(monkeypatch):
+    """Test that exists/isfile results are cached and dropped by changes made through either action class"""
+    monkeypatch.setattr(RemoteFileActions, 'cache_ttl', 5.0)
+    RemoteFileActions.clear_cache()
+    ssh = Mock(authentication=SSHConfig(remote_server='host', ssh_user='user', ssh_port='22'))
+    with patch('basicore.remote.RemoteCommand.execute') as mock_execute:
+        mock_execute.return_value = PropertyMock(success=True, completion=True, errors=False, stdout="0")
+        assert RemoteFileActions.exists("/data/dir/file", ssh) is True
+        assert RemoteFileActions.isfile("/data/dir/file", ssh) is True
+        assert RemoteFileActions.exists("/data/dir/file", ssh) is True
+        assert RemoteFileActions.isfile("/data/dir/file", ssh) is True
+        assert mock_execute.call_count == 2
+
+        RemoteFileActions.remove("/data/dir/file", ssh)
+        assert RemoteFileActions.exists("/data/dir/file", ssh) is True
+        assert mock_execute.call_count == 4
+
+        # Deleting the parent directory drops the file's entries too
+        RemoteDirActions.delete("/data/dir", ssh)
+        mock_execute.return_value = PropertyMock(success=True, completion=True, errors=False, stdout="1")
+        assert RemoteFileActions.exists("/data/dir/file", ssh) is False
+        assert mock_execute.call_count == 6
+    RemoteFileActions.clear_cache()
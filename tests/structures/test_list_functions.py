@@ -0,0 +1,49 @@
+from basicore.structures.list_functions import remove_empty_lines, separate_lines_in_mixed_list, strip_lines, window
+
+
+def test_remove_empty_lines():
+    assert remove_empty_lines([]) == []
+    assert remove_empty_lines(['hello\n', '\n', '', ' \t ', 'world\n']) == ['hello\n', 'world\n']
+    assert remove_empty_lines([' x ']) == [' x ']
+
+
+def test_strip_lines():
+    lines = ['  a  ', '', '   ', '\tb\n', ' c']
+    assert strip_lines(lines) == ['a', 'b', 'c']
+    assert strip_lines(lines, rstrip=False) == ['a  ', 'b\n', 'c']
+    assert strip_lines(lines, lstrip=False) == ['  a', '\tb', ' c']
+    assert strip_lines(lines, lstrip=False, rstrip=False) == ['  a', '\tb', ' c']
+    assert strip_lines([]) == []
+    assert strip_lines(['', ' \n ']) == []
+
+
+def test_strip_lines_multi_line_items():
+    # Each item is stripped at its ends only; line breaks inside it are kept
+    assert strip_lines(['  a  \n  b  ']) == ['a  \n  b']
+    assert strip_lines(['  a  \n  b  '], rstrip=False) == ['a  \n  b  ']
+
+
+def test_separate_lines_in_mixed_list():
+    assert separate_lines_in_mixed_list(['hello\n', '\n', 'world\n']) == ['hello', '', 'world']
+    assert separate_lines_in_mixed_list(['a\nb', ' ', 'c']) == ['a', 'b', 'c']
+    assert separate_lines_in_mixed_list([]) == []
+
+
+def test_window():
+    lines = ['a', 'b', 'c', 'd', 'e']
+    assert window(lines) == ['a', 'b', 'c', 'd', 'e']
+    assert window(lines, window_size=2) == ['a\nb', 'b\nc', 'c\nd', 'd\ne', 'e']
+    assert window(lines, window_size=2, step=2) == ['a\nb', 'c\nd', 'e']
+    assert window(lines, window_size=3, step=3) == ['a\nb\nc', 'd\ne']
+
+
+def test_window_larger_than_list():
+    assert window(['a', 'b'], window_size=5) == ['a\nb']
+    assert window(['a', 'b'], window_size=2, step=5) == ['a\nb']
+
+
+def test_window_empty_lines():
+    assert window([]) == []
+    assert window([], window_size=3) == []
+    assert window(['', 'a', ''], window_size=2) == ['\na', 'a\n', '']
+    assert window(['x\ny', 'z'], window_size=2) == ['x\ny\nz', 'z']
@@ -0,0 +1,85 @@
+from basicore.structures.str_functions import count_lspaces, escape_regex_special_chars, first_line, first_word, \
+    last_line, lremove, rremove
+
+
+def test_rremove():
+    assert rremove("value # comment") == "value "
+    assert rremove("value") == "value"
+    assert rremove("") == ""
+    assert rremove("# comment") == ""
+    assert rremove("value#") == "value"
+    assert rremove("a.b.c", ".") == "a"
+    assert rremove("a//b//c", "//") == "a"
+
+
+def test_rremove_multi_line():
+    # Each line is cut at its own first occurrence
+    assert rremove("a # one\nb\nc # two # three\n") == "a \nb\nc \n"
+    assert rremove("#\n#") == "\n"
+
+
+def test_lremove():
+    assert lremove("path#to#file") == "file"
+    assert lremove("value") == "value"
+    assert lremove("") == ""
+    assert lremove("#value") == "value"
+    assert lremove("value#") == ""
+    assert lremove("a//b//c", "//") == "c"
+
+
+def test_lremove_multi_line():
+    # Each line is cut at its own last occurrence
+    assert lremove("a#b#c\nd\ne#f\n") == "c\nd\nf\n"
+    assert lremove("#\n#") == "\n"
+
+
+def test_escape_regex_special_chars():
+    assert escape_regex_special_chars("") == ""
+    assert escape_regex_special_chars("plain text") == "plain text"
+    assert escape_regex_special_chars("a.b*c") == "a\\.b\\*c"
+    assert escape_regex_special_chars(".^$*+?{}[]\\|():") == "\\.\\^\\$\\*\\+\\?\\{\\}\\[\\]\\\\\\|\\(\\)\\:"
+    # Only the listed characters are escaped, unlike re.escape
+    assert escape_regex_special_chars("a-b #c") == "a-b #c"
+
+
+def test_count_lspaces():
+    assert count_lspaces("") == 0
+    assert count_lspaces("text") == 0
+    assert count_lspaces("    text") == 4
+    assert count_lspaces(" \t text ") == 3
+    assert count_lspaces("\ntext") == 0
+    # A line made only of spaces and tabs has no leading spaces
+    assert count_lspaces("  \t  ") == 0
+
+
+def test_first_line():
+    assert first_line("Hello\nworld!") == "Hello"
+    assert first_line("Hello") == "Hello"
+    assert first_line("\nworld") == ""
+    assert first_line("a\rb\nc") == "a"
+    assert first_line("a\r\nb") == "a"
+    assert first_line(None) == ""
+
+
+def test_last_line():
+    assert last_line("Hello\nworld!") == "world!"
+    assert last_line("Hello") == "Hello"
+    assert last_line("Hello\nworld!\n") == "world!"
+    assert last_line("Hello\n\n") == ""
+    assert last_line("a\nb\rc") == "c"
+    assert last_line("a\r\n") == "a"
+    assert last_line(None) == ""
+
+
+def test_first_last_line_empty():
+    # The original split raised IndexError here
+    assert first_line("") == ""
+    assert last_line("") == ""
+
+
+def test_first_word():
+    assert first_word("  Hello, world!") == "Hello,"
+    assert first_word("word") == "word"
+    assert first_word("\t\nword rest") == "word"
+    assert first_word("") == ""
+    assert first_word(" \t\n ") == ""